@@ -1,17 +1,62 @@
 """
 Flask application for testing external API scenarios.
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, current_app, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests.auth import HTTPBasicAuth
+from http.cookiejar import DefaultCookiePolicy
 import os
+import re
+import sys
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Union
 import json
 import base64
+import hashlib
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain
+import time
 from calendar import monthrange
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib json module
+    orjson = None
+
+# Runs of 19+ digits may be integers beyond 64 bits, which orjson parses as floats
+_LONG_DIGITS = re.compile(r'\d{19,}')
+_LONG_DIGITS_BYTES = re.compile(rb'\d{19,}')
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or bytes with the fastest backend that keeps every integer exact."""
+    if orjson:
+        long_digits = _LONG_DIGITS if isinstance(data, str) else _LONG_DIGITS_BYTES
+        if not long_digits.search(data):
+            return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes for an outgoing request body."""
+    if orjson:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits (and other types orjson rejects) go through the stdlib
+            pass
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
 # Configure logging
 # Only use basicConfig when NOT running under Gunicorn
 # Gunicorn has its own logging setup and basicConfig conflicts with it
@@ -25,7 +70,53 @@ if not os.getenv('gunicorn'):
 # Get logger - will use Gunicorn's logger if available
 logger = logging.getLogger(__name__)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes responses with orjson.
+
+    Anything orjson refuses to encode (e.g. an integer beyond 64 bits in an upstream
+    response) falls back to the default stdlib provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return json_loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a jsonify() response straight from orjson's bytes.
+
+        The base class formats the str from dumps() and the response encodes it back to
+        UTF-8; for large run results that round trip copies the whole payload twice.
+        """
+        # Same argument handling as the base class: one value as-is, several as a list
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and current_app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return super().response(obj)
+        return current_app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+if orjson:
+    app.json = ORJSONProvider(app)
 CORS(app)
 
 # When running under Gunicorn, configure to use its logger
@@ -42,6 +133,88 @@ if __name__ != '__main__':
 API_BASE_URL = os.getenv('API_BASE_URL', 'https://us-residentpay-external.d05d0001.entratadev.com')
 API_TIMEOUT = int(os.getenv('API_TIMEOUT', '30'))
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', '1'))
+# Browser cache lifetime (seconds) for the test runner page; revalidation still uses ETag/Last-Modified
+STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', '3600'))
+# Outbound test requests one worker process sends at once (pool size for scenarios/run-all);
+# higher finishes large runs sooner, lower is gentler on upstream rate limits
+MAX_CONCURRENT_REQUESTS = max(1, int(os.getenv('MAX_CONCURRENT_REQUESTS', '16')))
+# Largest binary (PDF/ZIP) response body passed back to the UI, in bytes
+MAX_BINARY_RESPONSE_BYTES = int(os.getenv('MAX_BINARY_RESPONSE_BYTES', str(20 * 1024 * 1024)))
+# Seconds a successful run-test/run-all response for a read-only request is reused; 0 disables the cache
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '0'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+
+
+def build_http_session(keep_cookies: bool = False) -> requests.Session:
+    """Create a requests session with a connection pool sized for concurrent test runs."""
+    session = requests.Session()
+    # Connection failures are retried for every method (nothing reached the server), but
+    # read errors and 502/503/504 only for reads: a gateway error on a PUT or POST does not
+    # mean the payment or account change wasn't applied, so those are never sent twice
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        raise_on_status=False
+    )
+    # Keep at least one pooled connection per concurrent request so none are discarded after use
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(64, MAX_CONCURRENT_REQUESTS), max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_cookies:
+        # Don't carry cookies from one test response into the next request
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+# Shared session for outbound test and token requests so keep-alive connections
+# (and their TCP/TLS handshakes) are reused instead of opened per request
+HTTP_SESSION = build_http_session()
+
+# Outbound test requests are network-bound, so batch endpoints (scenarios,
+# run-all) fan them out over this shared pool instead of running them serially
+_REQUEST_POOL = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+
+
+def _run_in_order(calls: List[tuple]) -> None:
+    """Run (future, fn, args) calls one after another, resolving each future as its call finishes."""
+    for future, fn, args in calls:
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+
+def submit_requests(calls: List[tuple]) -> List[Future]:
+    """
+    Submit (read_only, fn, args) calls to the shared pool and return one future per call, in order.
+    
+    Read-only calls run concurrently. The others change upstream state (add, delete, pay,
+    cancel, ...) and later ones may depend on earlier ones, so they are chained in a
+    single pool task and sent one at a time in the order given.
+    """
+    futures = []
+    in_order = []
+    for read_only, fn, args in calls:
+        if read_only:
+            futures.append(_REQUEST_POOL.submit(fn, *args))
+        else:
+            future = Future()
+            in_order.append((future, fn, args))
+            futures.append(future)
+    if in_order:
+        _REQUEST_POOL.submit(_run_in_order, in_order)
+    return futures
+
+
+# Request kwarg that carries the test case body for each supported HTTP method
+HTTP_METHOD_BODY_KWARGS = {
+    'GET': 'params',
+    'POST': 'json',
+    'PUT': 'json',
+    'DELETE': 'json'
+}
 
 # Environment ID to environment variable prefix mapping
 ENV_VAR_MAPPING = {
@@ -53,8 +226,66 @@ ENV_VAR_MAPPING = {
     'external-local': 'EXTERNAL_LOCAL'
 }
 
+# Per-environment variable names, formatted once:
+# (TOKEN_URL, CLIENT_ID, CLIENT_SECRET, OAUTH_SCOPE, API_KEY)
+ENV_VAR_KEYS = {
+    env_id: tuple(f'{env_prefix}_{suffix}' for suffix in ('TOKEN_URL', 'CLIENT_ID', 'CLIENT_SECRET', 'OAUTH_SCOPE', 'API_KEY'))
+    for env_id, env_prefix in ENV_VAR_MAPPING.items()
+}
+
+# Snapshot of the process environment that config loading reads from
+_ENV_SNAPSHOT: Dict[str, str] = dict(os.environ)
+
+
+# Static headers for OAuth2 client credentials token requests
+TOKEN_REQUEST_HEADERS = {
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'Accept': 'application/json'
+}
+
+
+# Production environments only accept requests for these CIDs
+PRODUCTION_ENVIRONMENTS = frozenset({'rapid-prod', 'standard-prod'})
+ALLOWED_PRODUCTION_CIDS = frozenset({4547, 1995})
+# validate_production_cid's answer for non-production environments, for callers that skip the call
+CID_CHECK_SKIPPED = (True, '')
+
+# Header names whose values are masked before logging or echoing
+SENSITIVE_HEADER_KEYS = frozenset({'authorization', 'x-api-key'})
+
+# Response headers left out of test results (x-amz-* headers are dropped as well)
+RESPONSE_HEADER_BLOCKLIST = frozenset({'set-cookie', 'server', 'date', 'via'})
+
+# The only response headers copied into /api/test/* results
+APITESTER_RESPONSE_HEADERS = ('Content-Type', 'Content-Length', 'X-Request-Id', 'X-Correlation-Id')
+
+# Response media types passed back base64-encoded instead of decoded as JSON/text
+BINARY_CONTENT_TYPES = frozenset({'application/pdf', 'application/zip', 'application/octet-stream'})
+
+
+@dataclass(slots=True)
+class EnvAuthState:
+    """OAuth2 credentials, API key and current bearer token for one environment."""
+    token_url: str
+    client_id: str
+    client_secret: str
+    scope: str
+    api_key: str
+    refresh_headers: Mapping[str, str]
+    refresh_data: Mapping[str, str]
+    grant_type: str = 'client_credentials'
+    oauth2_enabled: bool = True
+    bearer_token: str = ''
+    token_expires_at: int = 0
+    # Monotonic-clock (ns) refresh deadline; lets the per-request check skip the wall clock
+    token_valid_until_ns: int = 0
+
+
 def load_auth_config():
-    """Load authentication configuration from environment variables."""
+    """Load authentication configuration from environment variables.
+
+    config['environments'] maps each environment with credentials to its EnvAuthState.
+    """
     config = {
         'environments': {},
         'global': {
@@ -65,82 +296,96 @@ def load_auth_config():
     }
     
     # Build config from environment variables for each environment
+    env = _ENV_SNAPSHOT
     for env_id, env_prefix in ENV_VAR_MAPPING.items():
-        token_url = os.getenv(f'{env_prefix}_TOKEN_URL')
-        client_id = os.getenv(f'{env_prefix}_CLIENT_ID')
-        client_secret = os.getenv(f'{env_prefix}_CLIENT_SECRET')
-        scope = os.getenv(f'{env_prefix}_OAUTH_SCOPE', '')
-        api_key = os.getenv(f'{env_prefix}_API_KEY')
+        token_url_key, client_id_key, client_secret_key, scope_key, api_key_key = ENV_VAR_KEYS[env_id]
+        token_url = env.get(token_url_key)
+        client_id = env.get(client_id_key)
+        client_secret = env.get(client_secret_key)
+        scope = env.get(scope_key, '')
+        api_key = env.get(api_key_key)
         
         if token_url and client_id and client_secret:
-            config['environments'][env_id] = {
-                'oauth2': {
-                    'enabled': True,
-                    'token_url': token_url,
-                    'client_id': client_id,
-                    'client_secret': client_secret,
-                    'grant_type': 'client_credentials',
-                    'scope': scope
-                },
-                'api_key': api_key or '',
-                'bearer_token': '',
-                'token_expires_at': 0
-            }
-            logger.info(f'✅ Loaded OAuth2 config for {env_id} from environment variables')
+            # Credentials are fixed for the process lifetime, so the token request
+            # headers and form data are built once here rather than on every refresh
+            encoded_credentials = base64.b64encode(f'{client_id}:{client_secret}'.encode()).decode()
+            refresh_data = {'grant_type': 'client_credentials'}
+            if scope:
+                refresh_data['scope'] = scope
+            config['environments'][env_id] = EnvAuthState(
+                token_url=token_url,
+                client_id=client_id,
+                client_secret=client_secret,
+                scope=scope,
+                api_key=api_key or '',
+                # Read-only views: every refresh sends these exact objects
+                refresh_headers=MappingProxyType({**TOKEN_REQUEST_HEADERS, 'Authorization': f'Basic {encoded_credentials}'}),
+                refresh_data=MappingProxyType(refresh_data)
+            )
+            logger.info('✅ Loaded OAuth2 config for %s from environment variables', env_id)
             if api_key:
-                logger.info(f'✅ Loaded API key for {env_id} from environment variables')
+                logger.info('✅ Loaded API key for %s from environment variables', env_id)
         else:
-            logger.warning(f'⚠️  Missing OAuth2 env vars for {env_id} ({env_prefix}_*)')
+            logger.warning('⚠️  Missing OAuth2 env vars for %s (%s_*)', env_id, env_prefix)
     
     return config
 
 AUTH_CONFIG = load_auth_config()
 
+# Global custom headers with empty and placeholder (PASTE_...) values filtered out, read-only after startup
+SAFE_GLOBAL_HEADERS: Mapping[str, str] = MappingProxyType({
+    key: value
+    for key, value in AUTH_CONFIG.get('global', {}).get('custom_headers', {}).items()
+    if value and not value.startswith('PASTE_')
+})
+
+# Per-environment auth state, resolved once so lookups skip the 'environments' level
+ENV_STATE: Dict[str, EnvAuthState] = AUTH_CONFIG['environments']
+
+# Tokens are refreshed once less than this share of their lifetime (or 60 seconds) remains
+TOKEN_REFRESH_BUFFER_RATIO = 0.2
+TOKEN_REFRESH_MIN_BUFFER = 60
+
+# Per-environment locks so concurrent requests trigger a single token refresh
+_REFRESH_LOCKS = {env_id: threading.Lock() for env_id in ENV_VAR_MAPPING}
+
+
+def _get_env_cfg(environment_id: str) -> Optional[EnvAuthState]:
+    """Return the live auth state for an environment, or None if it has no credentials."""
+    return ENV_STATE.get(environment_id)
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string for response payloads."""
+    return datetime.now(timezone.utc).isoformat()
+
 
 def refresh_oauth2_token(environment_id: str = 'capricorn-trunk'):
-    """Refresh OAuth2 token using client credentials for specific environment."""
-    global AUTH_CONFIG
-    
+    """Refresh OAuth2 token using client credentials for specific environment.
+
+    Callers that may run concurrently should hold the environment's _REFRESH_LOCKS entry.
+    """
     try:
         # Get environment-specific OAuth2 config
-        env_config = AUTH_CONFIG.get('environments', {}).get(environment_id, {})
-        oauth2_config = env_config.get('oauth2', {})
+        state = _get_env_cfg(environment_id)
         
-        if not oauth2_config.get('enabled'):
-            logger.debug(f'OAuth2 is not enabled for {environment_id}')
+        if state is None or not state.oauth2_enabled:
+            logger.debug('OAuth2 is not enabled for %s', environment_id)
             return {'error': f'OAuth2 not enabled for {environment_id}', 'success': False}
         
-        token_url = oauth2_config.get('token_url')
-        client_id = oauth2_config.get('client_id')
-        client_secret = oauth2_config.get('client_secret')
-        scope = oauth2_config.get('scope')
-        grant_type = oauth2_config.get('grant_type', 'client_credentials')
+        token_url = state.token_url
         
-        if not all([token_url, client_id, client_secret]):
+        if not all([token_url, state.client_id, state.client_secret]):
             logger.error('Missing OAuth2 configuration')
             return {'error': 'Missing OAuth2 configuration', 'success': False}
         
-        # Prepare request
-        import base64
-        credentials = f"{client_id}:{client_secret}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'Accept': 'application/json',
-            'Authorization': f'Basic {encoded_credentials}'
-        }
-        
-        data = {
-            'grant_type': grant_type
-        }
-        
-        if scope:
-            data['scope'] = scope
+        # Prebuilt in load_auth_config
+        headers = state.refresh_headers
+        data = state.refresh_data
         
-        logger.info(f'Refreshing OAuth2 token from {token_url}')
+        logger.info('Refreshing OAuth2 token from %s', token_url)
         
-        response = requests.post(
+        response = HTTP_SESSION.post(
             token_url,
             headers=headers,
             data=data,
@@ -148,24 +393,24 @@ def refresh_oauth2_token(environment_id: str = 'capricorn-trunk'):
         )
         
         if response.status_code == 200:
-            token_data = response.json()
+            token_data = json_loads(response.content)
             access_token = token_data.get('access_token')
             expires_in = token_data.get('expires_in', 300)  # Default 5 minutes
             
-            # Calculate expiry time (subtract 60 seconds buffer for auto-refresh)
-            import time
-            expires_at = int(time.time()) + expires_in - 60
+            # Calculate expiry time, keeping a buffer of 20% of the token lifetime
+            # (at least 60 seconds) so tokens are rotated well before they expire.
+            # The wall-clock value is reported to clients; expiry checks use the
+            # monotonic one so they are immune to system clock changes.
+            refresh_in = expires_in - max(TOKEN_REFRESH_MIN_BUFFER, int(expires_in * TOKEN_REFRESH_BUFFER_RATIO))
+            expires_at = int(time.time()) + refresh_in
+            expires_at_mono_ns = time.monotonic_ns() + refresh_in * 1_000_000_000
             
-            # Update AUTH_CONFIG (in-memory) for this environment
-            if 'environments' not in AUTH_CONFIG:
-                AUTH_CONFIG['environments'] = {}
-            if environment_id not in AUTH_CONFIG['environments']:
-                AUTH_CONFIG['environments'][environment_id] = {}
+            # Update the in-memory auth state for this environment
+            state.bearer_token = access_token
+            state.token_expires_at = expires_at
+            state.token_valid_until_ns = expires_at_mono_ns
             
-            AUTH_CONFIG['environments'][environment_id]['bearer_token'] = access_token
-            AUTH_CONFIG['environments'][environment_id]['token_expires_at'] = expires_at
-            
-            logger.info(f'✅ Token refreshed successfully, expires in {expires_in} seconds')
+            logger.info('✅ Token refreshed successfully, expires in %s seconds', expires_in)
             
             return {
                 'success': True,
@@ -185,39 +430,44 @@ def refresh_oauth2_token(environment_id: str = 'capricorn-trunk'):
         return {'error': error_msg, 'success': False}
 
 
-def is_token_expired(environment_id: str = 'capricorn-trunk'):
-    """Check if the current token is expired or will expire soon for specific environment."""
-    import time
-    env_config = AUTH_CONFIG.get('environments', {}).get(environment_id, {})
-    expires_at = env_config.get('token_expires_at', 0)
-    current_time = int(time.time())
-    
-    # Token is expired or will expire in next 60 seconds
-    return expires_at <= current_time
+def is_token_expired(environment_id: str = 'capricorn-trunk', now_ns: Optional[int] = None):
+    """Check if the current token is expired or will expire soon for specific environment.
+
+    now_ns is a time.monotonic_ns() reading the caller already has; it is read here if omitted.
+    """
+    state = _get_env_cfg(environment_id)
+    if state is None:
+        return True
+    if now_ns is None:
+        now_ns = time.monotonic_ns()
+    # Token is expired or about to expire (refresh buffer applied at refresh time)
+    return state.token_valid_until_ns <= now_ns
 
 
 def ensure_valid_token(environment_id: str = 'capricorn-trunk'):
     """Ensure we have a valid token for specific environment, refresh if necessary."""
-    env_config = AUTH_CONFIG.get('environments', {}).get(environment_id, {})
-    oauth2_config = env_config.get('oauth2', {})
+    state = _get_env_cfg(environment_id)
     
-    if not oauth2_config.get('enabled'):
+    if state is None or not state.oauth2_enabled:
         return True  # OAuth2 not enabled for this environment
     
-    # Check if token exists
-    bearer_token = env_config.get('bearer_token', '')
-    if not bearer_token:
-        logger.info(f'No token found for {environment_id}, refreshing...')
-        result = refresh_oauth2_token(environment_id)
-        return result.get('success', False)
-    
-    # Check if token is expired
-    if is_token_expired(environment_id):
-        logger.info(f'Token expired or expiring soon for {environment_id}, auto-refreshing...')
+    # Fast path: token exists and is still valid
+    if state.bearer_token and not is_token_expired(environment_id, time.monotonic_ns()):
+        return True
+    
+    # Only one thread per environment talks to the token endpoint; the others
+    # wait here and reuse the token it fetched
+    with _REFRESH_LOCKS[environment_id]:
+        bearer_token = state.bearer_token
+        if not bearer_token:
+            logger.info('No token found for %s, refreshing...', environment_id)
+        elif is_token_expired(environment_id):  # Fresh clock read: we may have waited on the lock
+            logger.info('Token expired or expiring soon for %s, auto-refreshing...', environment_id)
+        else:
+            return True  # Refreshed by another thread while we waited
+        
         result = refresh_oauth2_token(environment_id)
         return result.get('success', False)
-    
-    return True
 
 
 def validate_production_cid(request_body: Dict[str, Any], environment_id: str) -> tuple[bool, str]:
@@ -231,10 +481,6 @@ def validate_production_cid(request_body: Dict[str, Any], environment_id: str) -
     Returns:
         Tuple of (is_valid, error_message)
     """
-    # Define production environments
-    PRODUCTION_ENVIRONMENTS = ['rapid-prod', 'standard-prod']
-    ALLOWED_PRODUCTION_CIDS = [4547, 1995]
-    
     # Only validate for production environments
     if environment_id not in PRODUCTION_ENVIRONMENTS:
         return True, ''
@@ -245,84 +491,166 @@ def validate_production_cid(request_body: Dict[str, Any], environment_id: str) -
     
     cid = request_body.get('cid')
     
-    # Validate CID is in allowed list
-    try:
-        cid_int = int(cid)
-        if cid_int not in ALLOWED_PRODUCTION_CIDS:
-            return False, f'🔴 PRODUCTION SAFETY: CID {cid} is not allowed in production. Only CID 4547 or 1995 are permitted.'
-    except (ValueError, TypeError):
-        return False, f'🔴 PRODUCTION SAFETY: Invalid CID format: {cid}'
+    # Validate CID is in allowed list (ints straight from JSON skip the conversion)
+    if type(cid) is int:
+        cid_int = cid
+    else:
+        try:
+            cid_int = int(cid)
+        except (ValueError, TypeError):
+            return False, f'🔴 PRODUCTION SAFETY: Invalid CID format: {cid}'
+    
+    if cid_int not in ALLOWED_PRODUCTION_CIDS:
+        return False, f'🔴 PRODUCTION SAFETY: CID {cid} is not allowed in production. Only CID 4547 or 1995 are permitted.'
     
     # Validation passed
-    logger.info(f'✅ Production CID validation passed: CID {cid} for environment {environment_id}')
+    logger.info('✅ Production CID validation passed: CID %s for environment %s', cid, environment_id)
     return True, ''
 
 
 def merge_headers(test_headers: Dict[str, str], use_bearer_token: bool = False, environment_id: str = 'capricorn-trunk') -> Dict[str, str]:
-    """Merge test headers with global auth headers."""
-    headers = dict(test_headers or {})
-    
-    # Get environment-specific config
-    env_config = AUTH_CONFIG.get('environments', {}).get(environment_id, {})
+    """
+    Merge test headers with global auth headers.
     
-    # Add Bearer token only if explicitly requested
-    if use_bearer_token:
-        # Ensure token is valid for this environment (auto-refresh if needed)
-        ensure_valid_token(environment_id)
-        
-        # Get bearer token from environment-specific config
-        bearer_token = env_config.get('bearer_token', '')
-        if bearer_token and 'Authorization' not in headers:
-            headers['Authorization'] = f'Bearer {bearer_token}'
+    Returns test_headers itself when the merge would not change it, so callers must not mutate the result.
+    """
+    headers = test_headers or {}
+    
+    # Get environment-specific config; environments without credentials add nothing
+    state = _get_env_cfg(environment_id)
+    bearer_token = api_key = ''
+    if state is not None:
+        # Add Bearer token only if explicitly requested
+        if use_bearer_token:
+            # A live token needs one clock comparison; otherwise validate (and auto-refresh if needed)
+            if not (state.bearer_token and time.monotonic_ns() < state.token_valid_until_ns):
+                ensure_valid_token(environment_id)
+            bearer_token = state.bearer_token
+        api_key = state.api_key
+    
+    # Copy only once something actually has to be added or overridden
+    if (SAFE_GLOBAL_HEADERS.keys() <= headers.keys()
+            and not (bearer_token and 'Authorization' not in headers)
+            and (not api_key or headers.get('x-api-key') == api_key)):
+        return headers
+    
+    # Global custom headers first so test headers take precedence over them
+    headers = {**SAFE_GLOBAL_HEADERS, **headers}
+    
+    if bearer_token and 'Authorization' not in headers:
+        headers['Authorization'] = f'Bearer {bearer_token}'
     
     # Add environment-specific API key (ALWAYS override hardcoded values)
-    api_key = env_config.get('api_key')
     if api_key:
         headers['x-api-key'] = api_key
-        logger.debug(f'Using API key from environment config for {environment_id}')
+        logger.debug('Using API key from environment config for %s', environment_id)
+    
+    return headers
+
+
+def overlay_headers(base_headers: Dict[str, str], test_headers: Optional[Dict[str, str]], environment_id: str) -> Dict[str, str]:
+    """
+    Apply a test case's headers over headers precomputed once by merge_headers({}, ...).
+    
+    Gives the same result as calling merge_headers with the test headers, so callers
+    running many test cases can skip the global merge and token check per case.
+    """
+    if not test_headers:
+        return base_headers
+    
+    headers = {**base_headers, **test_headers}
     
-    # Add global custom headers (but don't override already set headers)
-    global_custom_headers = AUTH_CONFIG.get('global', {}).get('custom_headers', {})
-    if global_custom_headers:
-        for key, value in global_custom_headers.items():
-            if key not in headers and value and not value.startswith('PASTE_'):
-                headers[key] = value
+    # The environment API key still overrides whatever the test case sets
+    state = _get_env_cfg(environment_id)
+    if state is not None and state.api_key:
+        headers['x-api-key'] = state.api_key
     
     return headers
 
 
+@lru_cache(maxsize=512)
+def _build_url(base_slash: str, endpoint: str) -> str:
+    """Join a slash-terminated base URL and an endpoint; the set of tested endpoints is small and repeats."""
+    return base_slash + endpoint.lstrip('/')
+
+
 class APITester:
     """Handles API testing scenarios."""
     
     def __init__(self, base_url: str, timeout: int = 30):
-        self.base_url = base_url.rstrip('/')
+        self.base_url = base_url
         self.timeout = timeout
-        self.session = requests.Session()
+        # Pooled keep-alive connections with retries on connection failures (and 502/503/504
+        # for reads); cookies persist across calls as with the plain session it replaces
+        self.session = build_http_session(keep_cookies=True)
+    
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+    
+    @base_url.setter
+    def base_url(self, value: str):
+        # Keep the slash-terminated prefix alongside so URL building is a single concatenation
+        self._base_url = value.rstrip('/')
+        self._base_slash = self._base_url + '/'
+    
+    @staticmethod
+    def _decode_response(response: requests.Response) -> Any:
+        """Return the parsed JSON body, or the text body when it is not valid JSON."""
+        # Parse the raw bytes directly; response.json() would re-detect the encoding first
+        try:
+            return json_loads(response.content)
+        except ValueError:
+            return response.text
+
+    @staticmethod
+    def _build_response(response: requests.Response, started_ns: int) -> Dict[str, Any]:
+        """Shape a response into the result dict returned by the test_* methods.
+
+        started_ns is the time.perf_counter_ns() reading taken just before the request was sent.
+        """
+        response_time_ms = (time.perf_counter_ns() - started_ns) // 1_000_000
+        response_headers = response.headers
+        return {
+            'status_code': response.status_code,
+            # Pick a few known headers instead of copying all of them (cookies, CORS, tracing, ...)
+            'headers': {
+                name: response_headers[name]
+                for name in APITESTER_RESPONSE_HEADERS
+                if name in response_headers
+            },
+            'data': APITester._decode_response(response),
+            'response_time_ms': response_time_ms,
+            'success': 200 <= response.status_code < 300
+        }
     
-    def test_get_request(
+    def _do_request(
         self,
+        method: str,
         endpoint: str,
+        *,
         headers: Optional[Dict[str, str]] = None,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Test GET request scenario."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        """Send one request through the pooled session and shape the result (shared by the test_* methods)."""
+        url = _build_url(self._base_slash, endpoint)
         
         try:
-            response = self.session.get(
+            started_ns = time.perf_counter_ns()
+            response = self.session.request(
+                method,
                 url,
-                headers=headers or {},
-                params=params or {},
+                headers=headers,
+                params=params,
+                # A JSON body wins over form data, as before
+                json=json_data or None,
+                data=None if json_data else data,
                 timeout=self.timeout
             )
             
-            return {
-                'status_code': response.status_code,
-                'headers': dict(response.headers),
-                'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'response_time_ms': response.elapsed.total_seconds() * 1000,
-                'success': 200 <= response.status_code < 300
-            }
+            return self._build_response(response, started_ns)
         except requests.exceptions.Timeout:
             return {'error': 'Request timeout', 'success': False}
         except requests.exceptions.ConnectionError:
@@ -330,6 +658,15 @@ class APITester:
         except Exception as e:
             return {'error': str(e), 'success': False}
     
+    def test_get_request(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Test GET request scenario."""
+        return self._do_request('GET', endpoint, headers=headers, params=params)
+    
     def test_post_request(
         self,
         endpoint: str,
@@ -338,37 +675,7 @@ class APITester:
         json_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Test POST request scenario."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
-        try:
-            if json_data:
-                response = self.session.post(
-                    url,
-                    json=json_data,
-                    headers=headers or {},
-                    timeout=self.timeout
-                )
-            else:
-                response = self.session.post(
-                    url,
-                    data=data or {},
-                    headers=headers or {},
-                    timeout=self.timeout
-                )
-            
-            return {
-                'status_code': response.status_code,
-                'headers': dict(response.headers),
-                'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'response_time_ms': response.elapsed.total_seconds() * 1000,
-                'success': 200 <= response.status_code < 300
-            }
-        except requests.exceptions.Timeout:
-            return {'error': 'Request timeout', 'success': False}
-        except requests.exceptions.ConnectionError:
-            return {'error': 'Connection error', 'success': False}
-        except Exception as e:
-            return {'error': str(e), 'success': False}
+        return self._do_request('POST', endpoint, headers=headers, data=data, json_data=json_data)
     
     def test_put_request(
         self,
@@ -378,37 +685,7 @@ class APITester:
         json_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Test PUT request scenario."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
-        try:
-            if json_data:
-                response = self.session.put(
-                    url,
-                    json=json_data,
-                    headers=headers or {},
-                    timeout=self.timeout
-                )
-            else:
-                response = self.session.put(
-                    url,
-                    data=data or {},
-                    headers=headers or {},
-                    timeout=self.timeout
-                )
-            
-            return {
-                'status_code': response.status_code,
-                'headers': dict(response.headers),
-                'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'response_time_ms': response.elapsed.total_seconds() * 1000,
-                'success': 200 <= response.status_code < 300
-            }
-        except requests.exceptions.Timeout:
-            return {'error': 'Request timeout', 'success': False}
-        except requests.exceptions.ConnectionError:
-            return {'error': 'Connection error', 'success': False}
-        except Exception as e:
-            return {'error': str(e), 'success': False}
+        return self._do_request('PUT', endpoint, headers=headers, data=data, json_data=json_data)
     
     def test_delete_request(
         self,
@@ -416,28 +693,7 @@ class APITester:
         headers: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """Test DELETE request scenario."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
-        try:
-            response = self.session.delete(
-                url,
-                headers=headers or {},
-                timeout=self.timeout
-            )
-            
-            return {
-                'status_code': response.status_code,
-                'headers': dict(response.headers),
-                'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'response_time_ms': response.elapsed.total_seconds() * 1000,
-                'success': 200 <= response.status_code < 300
-            }
-        except requests.exceptions.Timeout:
-            return {'error': 'Request timeout', 'success': False}
-        except requests.exceptions.ConnectionError:
-            return {'error': 'Connection error', 'success': False}
-        except Exception as e:
-            return {'error': str(e), 'success': False}
+        return self._do_request('DELETE', endpoint, headers=headers)
     
     def test_authentication(
         self,
@@ -448,33 +704,27 @@ class APITester:
         password: Optional[str] = None
     ) -> Dict[str, Any]:
         """Test authentication scenarios."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = _build_url(self._base_slash, endpoint)
         headers = {}
+        auth = None
         
         try:
             if auth_type.lower() == 'bearer' and token:
                 headers['Authorization'] = f'Bearer {token}'
             elif auth_type.lower() == 'basic' and username and password:
-                from requests.auth import HTTPBasicAuth
                 auth = HTTPBasicAuth(username, password)
-            else:
-                auth = None
             
+            started_ns = time.perf_counter_ns()
             response = self.session.get(
                 url,
                 headers=headers,
-                auth=auth if 'auth' in locals() else None,
+                auth=auth,
                 timeout=self.timeout
             )
             
-            return {
-                'status_code': response.status_code,
-                'authenticated': response.status_code != 401,
-                'headers': dict(response.headers),
-                'data': response.json() if response.headers.get('content-type', '').startswith('application/json') else response.text,
-                'response_time_ms': response.elapsed.total_seconds() * 1000,
-                'success': response.status_code != 401
-            }
+            result = self._build_response(response, started_ns)
+            result['authenticated'] = result['success'] = response.status_code != 401
+            return result
         except Exception as e:
             return {'error': str(e), 'success': False, 'authenticated': False}
 
@@ -483,14 +733,36 @@ class APITester:
 api_tester = APITester(API_BASE_URL, API_TIMEOUT)
 
 
+def _reinit_after_fork() -> None:
+    """Give a forked worker its own HTTP sessions and request pool.
+    
+    With Gunicorn's preload_app the module is imported once in the master; pooled sockets
+    and executor threads must not be shared with (or assumed alive in) the forked workers.
+    """
+    global HTTP_SESSION, _REQUEST_POOL
+    HTTP_SESSION = build_http_session()
+    _REQUEST_POOL = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+    api_tester.session = build_http_session(keep_cookies=True)
+
+
+os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+def close_http_clients() -> None:
+    """Close the pooled HTTP sessions and stop the request pool (called when a worker exits)."""
+    _REQUEST_POOL.shutdown(wait=False, cancel_futures=True)
+    HTTP_SESSION.close()
+    api_tester.session.close()
+
+
+# Static part of the /health payload; only the timestamp changes per call
+_HEALTH_BASE = MappingProxyType({'status': 'healthy', 'service': 'external-api-tester'})
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'service': 'external-api-tester'
-    }), 200
+    return jsonify({**_HEALTH_BASE, 'timestamp': utc_timestamp()}), 200
 
 
 @app.route('/api/test/get', methods=['POST'])
@@ -571,6 +843,48 @@ def test_auth():
     return jsonify(result), 200
 
 
+def _run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single entry of a /api/test/scenarios request."""
+    test_type = scenario.get('type', '').lower()
+    endpoint = scenario.get('endpoint', '')
+    
+    if not endpoint:
+        return {'error': 'endpoint is required', 'scenario': scenario}
+    
+    if test_type == 'get':
+        result = api_tester.test_get_request(
+            endpoint,
+            scenario.get('headers', {}),
+            scenario.get('params', {})
+        )
+    elif test_type == 'post':
+        result = api_tester.test_post_request(
+            endpoint,
+            scenario.get('data'),
+            scenario.get('headers', {}),
+            scenario.get('json')
+        )
+    elif test_type == 'put':
+        result = api_tester.test_put_request(
+            endpoint,
+            scenario.get('data'),
+            scenario.get('headers', {}),
+            scenario.get('json')
+        )
+    elif test_type == 'delete':
+        result = api_tester.test_delete_request(
+            endpoint,
+            scenario.get('headers', {})
+        )
+    else:
+        result = {'error': f'Unknown test type: {test_type}'}
+    
+    return {
+        'scenario': scenario.get('name', 'unnamed'),
+        'result': result
+    }
+
+
 @app.route('/api/test/scenarios', methods=['POST'])
 def test_scenarios():
     """Run multiple test scenarios."""
@@ -580,65 +894,39 @@ def test_scenarios():
     if not scenarios:
         return jsonify({'error': 'scenarios array is required'}), 400
     
-    results = []
-    for scenario in scenarios:
-        test_type = scenario.get('type', '').lower()
-        endpoint = scenario.get('endpoint', '')
-        
-        if not endpoint:
-            results.append({'error': 'endpoint is required', 'scenario': scenario})
-            continue
-        
-        if test_type == 'get':
-            result = api_tester.test_get_request(
-                endpoint,
-                scenario.get('headers', {}),
-                scenario.get('params', {})
-            )
-        elif test_type == 'post':
-            result = api_tester.test_post_request(
-                endpoint,
-                scenario.get('data'),
-                scenario.get('headers', {}),
-                scenario.get('json')
-            )
-        elif test_type == 'put':
-            result = api_tester.test_put_request(
-                endpoint,
-                scenario.get('data'),
-                scenario.get('headers', {}),
-                scenario.get('json')
-            )
-        elif test_type == 'delete':
-            result = api_tester.test_delete_request(
-                endpoint,
-                scenario.get('headers', {})
-            )
-        else:
-            result = {'error': f'Unknown test type: {test_type}'}
-        
-        results.append({
-            'scenario': scenario.get('name', 'unnamed'),
-            'result': result
-        })
+    # GET scenarios run concurrently; writes are sent one at a time in the given order
+    futures = submit_requests([
+        (scenario.get('type', '').lower() == 'get', _run_scenario, (scenario,))
+        for scenario in scenarios
+    ])
+    results = [future.result() for future in futures]
     
     return jsonify({'results': results}), 200
 
 
-@app.route('/api/config', methods=['GET'])
-def get_config():
-    """Get current configuration."""
-    return jsonify({
+def _build_config_view() -> Dict[str, Any]:
+    """Snapshot of the runtime configuration returned by /api/config."""
+    return {
         'api_base_url': API_BASE_URL,
         'api_timeout': API_TIMEOUT,
         'max_retries': MAX_RETRIES
-    }), 200
+    }
+
+
+# Replaced (never mutated) by update_config, so GET /api/config serializes it as-is
+_CONFIG_VIEW = _build_config_view()
+
+
+@app.route('/api/config', methods=['GET'])
+def get_config():
+    """Get current configuration."""
+    return jsonify(_CONFIG_VIEW), 200
 
 
 @app.route('/api/config', methods=['PUT'])
 def update_config():
     """Update configuration (runtime only, not persisted)."""
-    global API_BASE_URL, API_TIMEOUT, MAX_RETRIES
+    global API_BASE_URL, API_TIMEOUT, MAX_RETRIES, HTTP_SESSION, _CONFIG_VIEW
     
     data = request.get_json() or {}
     
@@ -652,21 +940,24 @@ def update_config():
     
     if 'max_retries' in data:
         MAX_RETRIES = int(data['max_retries'])
+        # A session's retry policy is fixed when it is built, so swap in sessions using the
+        # new value; requests already running finish on the old ones
+        HTTP_SESSION = build_http_session()
+        api_tester.session = build_http_session(keep_cookies=True)
+    
+    # Swap in a new view rather than mutating the one concurrent GETs may be serializing
+    _CONFIG_VIEW = _build_config_view()
     
     return jsonify({
         'message': 'Configuration updated',
-        'config': {
-            'api_base_url': API_BASE_URL,
-            'api_timeout': API_TIMEOUT,
-            'max_retries': MAX_RETRIES
-        }
+        'config': _CONFIG_VIEW
     }), 200
 
 
 @app.route('/test-runner', methods=['GET'])
 def test_runner_ui():
     """Serve the test runner UI."""
-    return send_from_directory('static', 'test-runner.html')
+    return send_from_directory('static', 'test-runner.html', max_age=STATIC_MAX_AGE)
 
 
 @app.route('/api/debug/headers', methods=['POST'])
@@ -681,7 +972,7 @@ def debug_headers():
         # Mask sensitive data
         safe_headers = {}
         for k, v in merged.items():
-            if k.lower() in ['authorization', 'x-api-key']:
+            if k.lower() in SENSITIVE_HEADER_KEYS:
                 safe_headers[k] = v[:30] + '...' if len(v) > 30 else v
             else:
                 safe_headers[k] = v
@@ -704,8 +995,13 @@ def refresh_token():
         data = request.get_json() or {}
         environment_id = data.get('environment', 'capricorn-trunk')
         
-        # Call the existing refresh function
-        result = refresh_oauth2_token(environment_id)
+        # Serialize with auto-refreshes so concurrent requests see one token POST
+        refresh_lock = _REFRESH_LOCKS.get(environment_id)
+        if refresh_lock is None:
+            result = refresh_oauth2_token(environment_id)  # Unknown environment, reports OAuth2 not enabled
+        else:
+            with refresh_lock:
+                result = refresh_oauth2_token(environment_id)
         
         if result.get('success'):
             return jsonify({
@@ -722,19 +1018,115 @@ def refresh_token():
             }), 400
             
     except Exception as e:
-        logger.error(f'Error in refresh-token endpoint: {e}')
+        logger.exception('Error in refresh-token endpoint: %s', e)
         return jsonify({'error': str(e), 'success': False}), 500
 
 
+# Parsed JSON config files: (path, prepare) -> (mtime_ns, prepared value)
+_JSON_CACHE: Dict[tuple, tuple] = {}
+_JSON_CACHE_LOCK = threading.Lock()
+
+
+def _load_json_cached(path: str, prepare=None) -> Any:
+    """
+    Load a JSON config file, re-parsing it only when its mtime changes.
+    
+    Args:
+        path: Path of the JSON file
+        prepare: Optional callable applied to the parsed object on (re)load;
+                 its return value is what gets cached and returned
+    
+    The returned object is shared between requests - callers must not mutate it.
+    """
+    cache_key = (path, prepare)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _JSON_CACHE.get(cache_key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with _JSON_CACHE_LOCK:
+        # Another thread may have reloaded the file while we waited for the lock
+        cached = _JSON_CACHE.get(cache_key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        with open(path, 'rb') as f:
+            data = json_loads(f.read())
+        value = prepare(data) if prepare else data
+        _JSON_CACHE[cache_key] = (mtime, value)
+        return value
+
+
+def _index_by_id(items) -> Dict[str, Dict[str, Any]]:
+    """Index a list of config entries by 'id', keeping the first entry for duplicate ids."""
+    index = {}
+    for item in items:
+        index.setdefault(item['id'], item)
+    return index
+
+
+def _index_environments(env_config: Dict[str, Any]) -> tuple:
+    """Build (env_config, environments by id) for the environments file."""
+    return env_config, _index_by_id(env_config.get('environments', []))
+
+
+def _index_test_cases(test_data: Dict[str, Any]) -> tuple:
+    """Build (test_data, test cases by id, prepared test cases) for a test cases file.
+
+    Methods are normalized to uppercase and interned, as are categories. Prepared test
+    cases are copies, in file order, carrying their precomputed request URL as '_url';
+    the id index points at the same copies. test_data itself is served to clients and stays free of those private keys.
+    """
+    test_cases = test_data.get('test_cases', [])
+    base_url = test_data.get('base_url', '')
+    for test_case in test_cases:
+        # Interned so the same few method/category strings are shared by every test case
+        # and the method table lookups compare by identity
+        if 'method' in test_case:
+            test_case['method'] = sys.intern(test_case['method'].upper())
+        if isinstance(test_case.get('category'), str):
+            test_case['category'] = sys.intern(test_case['category'])
+    prepared = [{**test_case, '_url': f"{base_url}{test_case['endpoint']}"} for test_case in test_cases]
+    return test_data, _index_by_id(prepared), prepared
+
+
+def load_environments() -> tuple:
+    """Return the cached environments config and its id index."""
+    return _load_json_cached('environments.json', _index_environments)
+
+
+def load_test_data(test_cases_file: str) -> tuple:
+    """Return the cached test data for a test cases file, its id index and prepared test cases."""
+    return _load_json_cached(test_cases_file, _index_test_cases)
+
+
+def _find_test_cases_by_name(test_cases, *fragments: str) -> tuple:
+    """
+    Find the first test case whose name contains each fragment (case-insensitive).
+    
+    Returns one entry per fragment, in order, with None where nothing matched. Each
+    name is lowercased once and the scan stops as soon as every fragment is found.
+    """
+    found = dict.fromkeys(fragments)
+    remaining = list(fragments)
+    for test_case in test_cases:
+        name = test_case.get('name', '').lower()
+        for fragment in [f for f in remaining if f in name]:
+            found[fragment] = test_case
+            remaining.remove(fragment)
+        if not remaining:
+            break
+    return tuple(found[fragment] for fragment in fragments)
+
+
 @app.route('/api/environments', methods=['GET'])
 def get_environments():
     """Get all available environments."""
     try:
-        with open('environments.json', 'r') as f:
-            environments = json.load(f)
+        environments, _ = load_environments()
         return jsonify(environments), 200
     except Exception as e:
-        logger.error(f'Error loading environments: {e}')
+        logger.exception('Error loading environments: %s', e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -744,30 +1136,34 @@ def get_test_cases():
     try:
         env_id = request.args.get('environment', 'capricorn-trunk')
         
-        # Load environments config
-        with open('environments.json', 'r') as f:
-            env_config = json.load(f)
-        
-        # Find the environment
-        env = next((e for e in env_config['environments'] if e['id'] == env_id), None)
+        # Load environments config and find the environment
+        _, environments_by_id = load_environments()
+        env = environments_by_id.get(env_id)
         if not env:
             return jsonify({'error': f'Environment {env_id} not found'}), 404
         
         # Load test cases for this environment
         test_cases_file = env['test_cases_file']
-        with open(test_cases_file, 'r') as f:
-            test_cases = json.load(f)
+        test_cases, _, _ = load_test_data(test_cases_file)
         
-        # Add environment info
-        test_cases['environment'] = env
+        # Add environment info (on a copy - the cached object is shared)
+        test_cases = {**test_cases, 'environment': env}
         
         return jsonify(test_cases), 200
     except Exception as e:
-        logger.error(f'Error loading test cases: {e}')
+        logger.exception('Error loading test cases: %s', e)
         return jsonify({'error': str(e)}), 500
 
 
-def calculate_auto_payment_dates(day_offset: int = 0) -> Dict[str, str]:
+def auto_payment_base_date() -> date:
+    """Return the base auto payment start date: the first day of next month."""
+    # Plain dates: isoformat() gives YYYY-MM-DD without going through strftime
+    today = date.today()
+    # month // 12 carries December into January
+    return today.replace(year=today.year + today.month // 12, month=today.month % 12 + 1, day=1)
+
+
+def calculate_auto_payment_dates(day_offset: int = 0, base_start_date: Optional[date] = None) -> Dict[str, str]:
     """
     Calculate dates for auto payment:
     - start_date: First day of next month + day_offset days
@@ -777,43 +1173,47 @@ def calculate_auto_payment_dates(day_offset: int = 0) -> Dict[str, str]:
     
     Args:
         day_offset: Number of days to add to the base start_date (for incremental dates)
+        base_start_date: auto_payment_base_date() computed once by callers preparing several scenarios
     """
-    today = datetime.now()
-    
-    # Calculate base start date (first day of next month)
-    if today.month == 12:
-        base_start_date = today.replace(year=today.year + 1, month=1, day=1)
-    else:
-        base_start_date = today.replace(month=today.month + 1, day=1)
+    if base_start_date is None:
+        base_start_date = auto_payment_base_date()
     
     # Add day offset for incremental dates
     start_date = base_start_date + timedelta(days=day_offset)
     
     # Calculate end_date: two months from start_date's month, always on the 1st
     # This ensures end_date is always the 1st of the month, regardless of start_date's day
-    if start_date.month <= 10:
-        end_date = start_date.replace(month=start_date.month + 2, day=1)
-    elif start_date.month == 11:
-        end_date = start_date.replace(year=start_date.year + 1, month=1, day=1)
-    else:  # month == 12
-        end_date = start_date.replace(year=start_date.year + 1, month=2, day=1)
+    month_index = start_date.month + 1  # zero-based index of the month two months on
+    end_date = start_date.replace(year=start_date.year + month_index // 12, month=month_index % 12 + 1, day=1)
     
     # For Bimonthly: first_payment on start_date, second_payment 14 days later
     # If start_date is 1st, second_payment should be 15th
-    if start_date.day == 1:
-        second_payment_date = start_date.replace(day=15)
-    else:
-        second_payment_date = start_date + timedelta(days=14)
+    second_payment_date = start_date.replace(day=15) if start_date.day == 1 else start_date + timedelta(days=14)
     
+    start_iso = start_date.isoformat()
     return {
-        'start_date': start_date.strftime('%Y-%m-%d'),
-        'end_date': end_date.strftime('%Y-%m-%d'),
-        'first_payment_start_date': start_date.strftime('%Y-%m-%d'),
-        'second_payment_start_date': second_payment_date.strftime('%Y-%m-%d')
+        'start_date': start_iso,
+        'end_date': end_date.isoformat(),
+        'first_payment_start_date': start_iso,
+        'second_payment_start_date': second_payment_date.isoformat()
     }
 
 
-def apply_auto_payment_config(request_body: Dict[str, Any], auto_payment_config: Dict[str, Any], day_offset: int = 0) -> Dict[str, Any]:
+def _coerce_id(value: Any) -> Any:
+    """Convert a numeric id string to int; ints and everything else are returned unchanged."""
+    # Exact type check: bool is an int subclass but must not be touched. ASCII digits only,
+    # as int() alone would also accept ' 12', '-3' and '1_000'
+    if type(value) is str and value.isascii() and value.isdigit():
+        return int(value)
+    return value
+
+
+def apply_auto_payment_config(
+    request_body: Dict[str, Any],
+    auto_payment_config: Dict[str, Any],
+    day_offset: int = 0,
+    base_start_date: Optional[date] = None
+) -> Dict[str, Any]:
     """
     Apply auto payment configuration to request body:
     - Update payment_account_id and payment_type_id if provided
@@ -824,36 +1224,37 @@ def apply_auto_payment_config(request_body: Dict[str, Any], auto_payment_config:
         request_body: The request body to modify
         auto_payment_config: Configuration with payment_account_id and payment_type_id
         day_offset: Number of days to offset start_date (for incremental dates per scenario)
+        base_start_date: Optional precomputed auto_payment_base_date(), shared across scenarios
     """
     if not isinstance(request_body, dict):
         return request_body
     
     # Update payment_account_id and payment_type_id if provided
     if auto_payment_config and 'payment_account_id' in auto_payment_config:
-        payment_account_id = auto_payment_config['payment_account_id']
-        request_body['payment_account_id'] = int(payment_account_id) if str(payment_account_id).isdigit() else payment_account_id
+        request_body['payment_account_id'] = _coerce_id(auto_payment_config['payment_account_id'])
     
     if auto_payment_config and 'payment_type_id' in auto_payment_config:
-        payment_type_id = auto_payment_config['payment_type_id']
-        request_body['payment_type_id'] = int(payment_type_id) if str(payment_type_id).isdigit() else payment_type_id
+        request_body['payment_type_id'] = _coerce_id(auto_payment_config['payment_type_id'])
     
     # Always calculate dates (required for Add Auto Payment) with day offset
-    dates = calculate_auto_payment_dates(day_offset=day_offset)
+    dates = calculate_auto_payment_dates(day_offset=day_offset, base_start_date=base_start_date)
     
     # Update start_date and end_date
     request_body['start_date'] = dates['start_date']
     request_body['end_date'] = dates['end_date']
     
     # Handle Bimonthly case
+    # Nested dicts are copied before writing so the cached test case bodies stay untouched
     if 'bimonthly' in request_body and isinstance(request_body['bimonthly'], dict):
+        request_body['bimonthly'] = dict(request_body['bimonthly'])
         if 'first_payment' in request_body['bimonthly']:
-            if not isinstance(request_body['bimonthly']['first_payment'], dict):
-                request_body['bimonthly']['first_payment'] = {}
+            first_payment = request_body['bimonthly']['first_payment']
+            request_body['bimonthly']['first_payment'] = dict(first_payment) if isinstance(first_payment, dict) else {}
             request_body['bimonthly']['first_payment']['start_date'] = dates['first_payment_start_date']
         
         if 'second_payment' in request_body['bimonthly']:
-            if not isinstance(request_body['bimonthly']['second_payment'], dict):
-                request_body['bimonthly']['second_payment'] = {}
+            second_payment = request_body['bimonthly']['second_payment']
+            request_body['bimonthly']['second_payment'] = dict(second_payment) if isinstance(second_payment, dict) else {}
             request_body['bimonthly']['second_payment']['start_date'] = dates['second_payment_start_date']
     
     return request_body
@@ -904,26 +1305,34 @@ def apply_make_payment_config(request_body: Dict[str, Any], make_payment_config:
     
     # Update payment_type_id if provided
     if make_payment_config and 'payment_type_id' in make_payment_config:
-        payment_type_id = make_payment_config['payment_type_id']
-        request_body['payment_type_id'] = int(payment_type_id) if str(payment_type_id).isdigit() else payment_type_id
+        request_body['payment_type_id'] = _coerce_id(make_payment_config['payment_type_id'])
     
     return request_body
 
 
-def apply_cancel_payment_config(request_body: Dict[str, Any], cancel_payment_ids: str) -> Dict[str, Any]:
+def parse_id_list(ids_csv: str) -> List[Any]:
+    """Split a comma-separated id string into a list of ids (numeric ones as int)."""
+    return [_coerce_id(id_str) for id_str in map(str.strip, ids_csv.split(',')) if id_str]
+
+
+def apply_cancel_payment_config(request_body: Dict[str, Any], cancel_payment_ids: Union[str, List[Any]]) -> Dict[str, Any]:
     """
     Apply cancel payment configuration to request body:
     - Update payment_ids or payment_id based on what's in the request body
     
     Args:
         request_body: The request body to modify
-        cancel_payment_ids: Comma-separated payment IDs string
+        cancel_payment_ids: Comma-separated payment IDs string, or a list already
+            parsed with parse_id_list() (callers applying it to many bodies parse once)
     """
     if not isinstance(request_body, dict) or not cancel_payment_ids:
         return request_body
     
-    # Parse comma-separated IDs
-    ids_list = [id_str.strip() for id_str in cancel_payment_ids.split(',') if id_str.strip()]
+    # Parse comma-separated IDs unless the caller already did
+    if isinstance(cancel_payment_ids, str):
+        ids_list = parse_id_list(cancel_payment_ids)
+    else:
+        ids_list = cancel_payment_ids
     
     if not ids_list:
         return request_body
@@ -932,20 +1341,15 @@ def apply_cancel_payment_config(request_body: Dict[str, Any], cancel_payment_ids
     # If it has payment_id, use that; otherwise use payment_ids
     if 'payment_id' in request_body:
         # Use singular - take first ID only
-        payment_id = ids_list[0]
-        request_body['payment_id'] = int(payment_id) if payment_id.isdigit() else payment_id
+        request_body['payment_id'] = ids_list[0]
     else:
         # Use plural - can be array or single value
         if len(ids_list) == 1:
             # Single ID - keep as single value (int or string)
-            payment_id = ids_list[0]
-            request_body['payment_ids'] = int(payment_id) if payment_id.isdigit() else payment_id
+            request_body['payment_ids'] = ids_list[0]
         else:
-            # Multiple IDs - convert to array of ints/strings
-            request_body['payment_ids'] = [
-                int(payment_id) if payment_id.isdigit() else payment_id
-                for payment_id in ids_list
-            ]
+            # Multiple IDs - each body gets its own copy of the list
+            request_body['payment_ids'] = list(ids_list)
     
     return request_body
 
@@ -981,118 +1385,415 @@ def apply_payment_status_config(request_body: Dict[str, Any], payment_status_id:
         return request_body
     
     # Update payment_id (convert to int if numeric, otherwise keep as string)
-    request_body['payment_id'] = int(payment_status_id) if payment_status_id.isdigit() else payment_status_id
+    request_body['payment_id'] = _coerce_id(payment_status_id)
     
     return request_body
 
 
+def filter_response_headers(headers) -> Dict[str, str]:
+    """Copy response headers into a plain dict, leaving out noisy transport headers."""
+    return {
+        key: value
+        for key, value in headers.items()
+        if key.lower() not in RESPONSE_HEADER_BLOCKLIST and not key.lower().startswith('x-amz-')
+    }
+
+
+def _read_binary_capped(response: requests.Response) -> Optional[bytes]:
+    """Read a streamed binary response body, or return None once it exceeds MAX_BINARY_RESPONSE_BYTES."""
+    declared_length = response.headers.get('Content-Length', '')
+    if declared_length.isdigit() and int(declared_length) > MAX_BINARY_RESPONSE_BYTES:
+        return None
+    
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        buffer += chunk
+        if len(buffer) > MAX_BINARY_RESPONSE_BYTES:
+            return None
+    return bytes(buffer)
+
+
+# Recent successful results of cacheable requests: cache key -> (expires_at_ns, result, validators).
+# Expired entries that carry ETag/Last-Modified validators are kept so they can be revalidated
+_RESPONSE_CACHE: Dict[str, tuple] = {}
+# Cacheable requests currently being sent: cache key -> Future that receives the result
+_RESPONSE_IN_FLIGHT: Dict[str, Future] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _response_cache_key(method: str, url: str, request_body: Any, env_id: str, include_headers: bool) -> str:
+    """Hash everything that decides a cacheable request's result into a short key."""
+    body = None
+    if orjson:
+        try:
+            body = orjson.dumps(request_body, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        except TypeError:
+            # An integer beyond 64 bits; the stdlib encodes it
+            pass
+    if body is None:
+        body = json.dumps(request_body, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{method}|{url}|{env_id}|{int(include_headers)}|'.encode('utf-8'))
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _store_cached_response(key: str, result: Dict[str, Any], validators: Optional[Dict[str, str]] = None) -> None:
+    """Cache a result for RESPONSE_CACHE_TTL seconds, evicting expired then oldest entries when full."""
+    now_ns = time.monotonic_ns()
+    with _RESPONSE_CACHE_LOCK:
+        if key not in _RESPONSE_CACHE and len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+            for stale_key in [k for k, (expires_at_ns, _, _) in _RESPONSE_CACHE.items() if expires_at_ns <= now_ns]:
+                del _RESPONSE_CACHE[stale_key]
+            if len(_RESPONSE_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del _RESPONSE_CACHE[next(iter(_RESPONSE_CACHE))]
+        _RESPONSE_CACHE[key] = (now_ns + RESPONSE_CACHE_TTL * 1_000_000_000, dict(result), validators)
+
+
+def _claim_response(key: str) -> tuple:
+    """
+    Look up a cacheable request before sending it.
+    
+    Returns (result, None, None) when a cached result exists or an identical request
+    already in flight has finished for us. Otherwise returns (None, future, stale): the
+    caller must send the request itself and hand its result to _finish_response, and
+    stale is the expired (result, validators) entry it may revalidate, if any.
+    """
+    with _RESPONSE_CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is not None and entry[0] > time.monotonic_ns():
+            hit, leader_future = entry[1], None
+        else:
+            hit = None
+            leader_future = _RESPONSE_IN_FLIGHT.get(key)
+            if leader_future is None:
+                own_future = _RESPONSE_IN_FLIGHT[key] = Future()
+                stale = entry[1:] if entry is not None and entry[2] else None
+                return None, own_future, stale
+    if hit is None:
+        # Share the identical in-flight request's result instead of sending another one
+        hit = leader_future.result()
+        if not hit.get('success'):
+            # A failed leader's result is passed on as is; it never came from the cache
+            return dict(hit), None, None
+    # Callers only add top-level keys, so a shallow copy keeps the shared result intact
+    return {**hit, 'response_time_ms': 0, 'cached': True, 'timestamp': utc_timestamp()}, None, None
+
+
+def _finish_response(
+    key: str,
+    future: Future,
+    result: Dict[str, Any],
+    validators: Optional[Dict[str, str]] = None
+) -> None:
+    """Cache a claimed request's result (when successful) and release the requests waiting on it."""
+    if result.get('success'):
+        _store_cached_response(key, result, validators)
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_IN_FLIGHT.pop(key, None)
+    future.set_result(dict(result))
+
+
 def execute_single_request(
     test_case: Dict[str, Any],
     request_body: Dict[str, Any],
     base_url: str,
     env_id: str,
-    scenario_name: Optional[str] = None
+    scenario_name: Optional[str] = None,
+    include_headers: bool = False,
+    merged_headers: Optional[Dict[str, str]] = None,
+    use_cache: bool = False
 ) -> Dict[str, Any]:
-    """Execute a single HTTP request for a test case with a specific body."""
-    url = f"{base_url}{test_case['endpoint']}"
-    start_time = datetime.utcnow()
+    """Execute a single HTTP request for a test case with a specific body.
+
+    Response headers are only copied into the result when include_headers is set.
+    merged_headers skips the per-call merge_headers() when the caller already built them.
+    use_cache lets GET requests (and test cases marked "cacheable") reuse a successful
+    result for RESPONSE_CACHE_TTL seconds, and coalesces identical ones that run at the
+    same time into one upstream call; workflows never pass it, since their reads must
+    see the writes made by earlier steps.
+    """
+    if not (use_cache and RESPONSE_CACHE_TTL > 0 and is_read_only(test_case)):
+        return _send_test_request(test_case, request_body, base_url, env_id, scenario_name, include_headers, merged_headers)
+    
+    url = test_case.get('_url') or f"{base_url}{test_case['endpoint']}"
+    cache_key = _response_cache_key(test_case['method'], url, request_body, env_id, include_headers)
+    result, future, stale = _claim_response(cache_key)
+    if future is None:
+        return result
+    
+    result = {'error': 'Request was not sent', 'success': False, 'timestamp': utc_timestamp()}
+    validators = {}
+    revalidated = False
+    try:
+        # An expired entry with an ETag/Last-Modified is revalidated with a conditional request
+        conditional_headers = None
+        if stale is not None:
+            stale_validators = stale[1]
+            conditional_headers = {}
+            if 'ETag' in stale_validators:
+                conditional_headers['If-None-Match'] = stale_validators['ETag']
+            if 'Last-Modified' in stale_validators:
+                conditional_headers['If-Modified-Since'] = stale_validators['Last-Modified']
+        result = _send_test_request(
+            test_case, request_body, base_url, env_id, scenario_name, include_headers, merged_headers,
+            conditional_headers, validators
+        )
+        if stale is not None and result.get('status_code') == 304:
+            # Not modified: serve the stored body again, and keep its validators unless new ones came back
+            validators = validators or stale[1]
+            result = {**stale[0], 'response_time_ms': result['response_time_ms'], 'timestamp': result['timestamp']}
+            revalidated = True
+        return {**result, 'cached': True, 'revalidated': True} if revalidated else result
+    finally:
+        # Always release the waiters, even if sending raised
+        _finish_response(cache_key, future, result, validators)
+
+
+def _send_test_request(
+    test_case: Dict[str, Any],
+    request_body: Dict[str, Any],
+    base_url: str,
+    env_id: str,
+    scenario_name: Optional[str],
+    include_headers: bool,
+    merged_headers: Optional[Dict[str, str]],
+    conditional_headers: Optional[Dict[str, str]] = None,
+    validators: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """Send a test case request and shape the response into a result dict (see execute_single_request).
+    
+    conditional_headers (If-None-Match/If-Modified-Since) are added to the request, and a
+    validators dict, when given, receives the response's ETag and Last-Modified headers.
+    """
+    url = test_case.get('_url') or f"{base_url}{test_case['endpoint']}"
+    start_ns = time.perf_counter_ns()
     
     try:
         # Merge test headers with global auth headers
-        merged_headers = merge_headers(test_case.get('headers', {}), use_bearer_token=True, environment_id=env_id)
+        if merged_headers is None:
+            merged_headers = merge_headers(test_case.get('headers', {}), use_bearer_token=True, environment_id=env_id)
         
-        # Log headers for debugging (remove sensitive data)
-        safe_headers = {k: v[:20]+'...' if k.lower() in ['authorization', 'x-api-key'] and len(v) > 20 else v 
-                      for k, v in merged_headers.items()}
-        log_msg = f'Test {test_case["id"]} - {test_case["name"]}'
-        if scenario_name:
-            log_msg += f' - Scenario: {scenario_name}'
-        logger.info(f'{log_msg} - Env: {env_id} - Headers: {safe_headers}')
-        logger.info(f'Test {test_case["id"]} - URL: {url}')
+        # Log headers for debugging (remove sensitive data); skipped entirely when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            safe_headers = {k: v[:20]+'...' if k.lower() in SENSITIVE_HEADER_KEYS and len(v) > 20 else v 
+                          for k, v in merged_headers.items()}
+            logger.info('Test %s - %s%s - Env: %s - Headers: %s', test_case['id'], test_case['name'],
+                        f' - Scenario: {scenario_name}' if scenario_name else '', env_id, safe_headers)
+            logger.info('Test %s - URL: %s', test_case['id'], url)
         
-        method = test_case['method'].upper()
-        if method == 'GET':
-            response = requests.get(
-                url,
-                headers=merged_headers,
-                params=request_body,
-                timeout=API_TIMEOUT
-            )
-        elif method == 'POST':
-            response = requests.post(
-                url,
-                headers=merged_headers,
-                json=request_body,
-                timeout=API_TIMEOUT
-            )
-        elif method == 'PUT':
-            response = requests.put(
-                url,
-                headers=merged_headers,
-                json=request_body,
-                timeout=API_TIMEOUT
-            )
-        else:
+        method = test_case['method']
+        body_kwarg = HTTP_METHOD_BODY_KWARGS.get(method)
+        if body_kwarg is None:
+            # Test cases served from the cache are already normalized; only raw ones need upper()
+            method = method.upper()
+            body_kwarg = HTTP_METHOD_BODY_KWARGS.get(method)
+        if body_kwarg is None:
             return {
                 'error': f'Unsupported method: {method}',
                 'success': False
             }
         
-        end_time = datetime.utcnow()
-        duration_ms = (end_time - start_time).total_seconds() * 1000
+        if conditional_headers:
+            merged_headers = {**merged_headers, **conditional_headers}
+        
+        if body_kwarg == 'json' and request_body is not None:
+            # Encode the body ourselves (orjson when available) instead of requests' stdlib json.dumps
+            body_kwarg, request_payload = 'data', json_dumps(request_body)
+            if not any(k.lower() == 'content-type' for k in merged_headers):
+                # merged_headers may be shared across scenarios, so never add to it in place
+                merged_headers = {**merged_headers, 'Content-Type': 'application/json'}
+        else:
+            request_payload = request_body
+        
+        response = HTTP_SESSION.request(
+            method,
+            url,
+            headers=merged_headers,
+            timeout=API_TIMEOUT,
+            # Body is read below, so binary downloads can be size-capped while streaming
+            stream=True,
+            **{body_kwarg: request_payload}
+        )
         
         # Check content type to handle binary responses (PDF, ZIP, etc.)
         content_type = response.headers.get('Content-Type', '').lower()
-        is_binary = 'application/pdf' in content_type or 'application/zip' in content_type or 'application/octet-stream' in content_type
+        media_type = content_type.split(';', 1)[0].strip()
+        is_binary = media_type in BINARY_CONTENT_TYPES
+        
+        try:
+            body = _read_binary_capped(response) if is_binary else response.content
+        finally:
+            response.close()
+        duration_ms = round((time.perf_counter_ns() - start_ns) / 1e6, 2)
         
         try:
-            if is_binary:
-                # For binary responses, encode as base64 for JSON transport
-                response_data = base64.b64encode(response.content).decode('utf-8')
+            if body is None:
+                response_data = f'Binary response exceeds {MAX_BINARY_RESPONSE_BYTES} bytes'
+                response_data_type = 'error'
+            elif is_binary:
+                # For binary responses, encode as base64 for JSON transport (base64 output is pure ASCII)
+                response_data = base64.b64encode(body).decode('ascii')
                 response_data_type = 'binary'
             else:
-                # Try to parse as JSON, fallback to text
-                try:
-                    response_data = response.json()
-                    response_data_type = 'json'
-                except:
-                    response_data = response.text
-                    response_data_type = 'text'
+                # Parse as JSON only when the media type says so (or is missing), falling back
+                # to text; both work on the raw bytes (response.text would run charset
+                # detection when no encoding is declared)
+                response_data_type = 'text'
+                if 'json' in media_type or not media_type:
+                    try:
+                        response_data = json_loads(body)
+                        response_data_type = 'json'
+                    except ValueError:
+                        pass
+                if response_data_type == 'text':
+                    response_data = body.decode(response.encoding or 'utf-8', errors='replace')
         except Exception as e:
             response_data = str(e)
             response_data_type = 'error'
         
-        return {
+        result = {
             'status_code': response.status_code,
             'success': 200 <= response.status_code < 300,
-            'response_time_ms': round(duration_ms, 2),
+            'response_time_ms': duration_ms,
             'response_data': response_data,
             'response_data_type': response_data_type,
             'content_type': content_type,
-            'headers': dict(response.headers),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_timestamp()
         }
+        if include_headers:
+            result['headers'] = filter_response_headers(response.headers)
+        if validators is not None:
+            for name in ('ETag', 'Last-Modified'):
+                value = response.headers.get(name)
+                if value:
+                    validators[name] = value
+        return result
         
     except requests.exceptions.Timeout:
         return {
             'error': 'Request timeout',
             'success': False,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_timestamp()
         }
     except requests.exceptions.ConnectionError as e:
         return {
             'error': f'Connection error: {str(e)}',
             'success': False,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_timestamp()
         }
     except Exception as e:
         return {
             'error': str(e),
             'success': False,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_timestamp()
         }
 
 
+def _run_queued_scenarios(
+    results: list,
+    test_case: Dict[str, Any],
+    base_url: str,
+    env_id: str,
+    include_headers: bool = False,
+    use_cache: bool = False
+) -> None:
+    """
+    Send the scenarios queued in results as (request_body, scenario_name) tuples and
+    replace each tuple with its result, in place, so results keep scenario order.
+    
+    Scenarios of a read-only test case run concurrently on the shared pool; those of a
+    state-changing one (e.g. one Add Payment Account per body) go one at a time in
+    scenario order, as they did before. They all belong to one test case, so its
+    headers are merged (and the token checked) once up front.
+    """
+    pending = [(idx, entry) for idx, entry in enumerate(results) if isinstance(entry, tuple)]
+    if not pending:
+        return
+    
+    merged_headers = merge_headers(test_case.get('headers', {}), use_bearer_token=True, environment_id=env_id)
+    read_only = is_read_only(test_case)
+    futures = submit_requests([
+        (
+            read_only,
+            execute_single_request,
+            (test_case, request_body, base_url, env_id, scenario_name, include_headers, merged_headers, use_cache)
+        )
+        for _, (request_body, scenario_name) in pending
+    ])
+    for (idx, (request_body, scenario_name)), future in zip(pending, futures):
+        result = future.result()
+        result['test_id'] = test_case['id']
+        result['test_name'] = test_case['name']
+        result['scenario_name'] = scenario_name
+        result['request_body'] = request_body
+        results[idx] = result
+
+
+def _scenario_body(body: Dict[str, Any], common_params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a new request body dict with common params merged in.
+    
+    The result is the caller's own top-level copy of a cached test case body; the apply_*
+    helpers only write top-level keys or copy the nested dicts they edit.
+    """
+    if isinstance(common_params, dict):
+        return merge_common_params(body, common_params)
+    return dict(body)
+
+
+def _queue_id_scenarios(
+    results: list,
+    request_body: Dict[str, Any],
+    ids_csv: str,
+    field: str,
+    label: str,
+    test_id: str,
+    test_name: str,
+    env_id: str
+) -> bool:
+    """
+    Queue one scenario per id in a comma-separated list, each a copy of request_body with field set to that id.
+    
+    Scenarios failing production CID validation are added to results as blocked; the rest are
+    queued as (request_body, scenario_name) tuples for _run_queued_scenarios.
+    Returns False when the list holds no ids, so the caller can fall back to the plain request.
+    """
+    # Only production environments restrict the CID; decide that once for all scenarios
+    enforce_cid = env_id in PRODUCTION_ENVIRONMENTS
+    ids_list = [id_str.strip() for id_str in ids_csv.split(',') if id_str.strip()]
+    for id_str in ids_list:
+        scenario_name = f'{label}: {id_str}'
+        current_request_body = request_body.copy()
+        # Convert to int if it's numeric, otherwise keep as string
+        current_request_body[field] = _coerce_id(id_str)
+        
+        # Validate CID for production environments
+        is_valid, error_message = validate_production_cid(current_request_body, env_id) if enforce_cid else CID_CHECK_SKIPPED
+        if not is_valid:
+            logger.warning('🔴 Production CID validation failed for test %s, %s %s: %s', test_id, field, id_str, error_message)
+            results.append({
+                'test_id': test_id,
+                'test_name': test_name,
+                'scenario_name': scenario_name,
+                'error': error_message,
+                'success': False,
+                'blocked': True,
+                'timestamp': utc_timestamp()
+            })
+            continue
+        
+        results.append((current_request_body, scenario_name))
+    return bool(ids_list)
+
+
+def _text_param(data: Dict[str, Any], key: str) -> str:
+    """Return a string field of the request data stripped, or '' when it is missing or not a string."""
+    value = data.get(key, '')
+    return value.strip() if isinstance(value, str) else ''
+
+
 @app.route('/api/run-test/<test_id>', methods=['POST'])
 def run_single_test(test_id):
     """Run a single test case. Supports both single body and multiple bodies (bodies array)."""
@@ -1100,22 +1801,22 @@ def run_single_test(test_id):
         # Get environment from request
         data = request.get_json() or {}
         env_id = data.get('environment', 'capricorn-trunk')
+        # Response headers are opt-in to keep result payloads small
+        include_headers = request.args.get('include_headers') == '1'
+        # ?no_cache=1 always hits the live API, even when RESPONSE_CACHE_TTL is set
+        use_cache = request.args.get('no_cache') != '1'
         
-        # Load environments config
-        with open('environments.json', 'r') as f:
-            env_config = json.load(f)
-        
-        # Find the environment
-        env = next((e for e in env_config['environments'] if e['id'] == env_id), None)
+        # Load environments config and find the environment
+        _, environments_by_id = load_environments()
+        env = environments_by_id.get(env_id)
         if not env:
             return jsonify({'error': f'Environment {env_id} not found'}), 404
         
         # Load test cases for this environment
         test_cases_file = env['test_cases_file']
-        with open(test_cases_file, 'r') as f:
-            test_data = json.load(f)
+        test_data, test_cases_by_id, _ = load_test_data(test_cases_file)
         
-        test_case = next((tc for tc in test_data['test_cases'] if tc['id'] == test_id), None)
+        test_case = test_cases_by_id.get(test_id)
         if not test_case:
             return jsonify({'error': 'Test case not found'}), 404
         
@@ -1123,6 +1824,24 @@ def run_single_test(test_id):
         common_params = test_data.get('common_params', {})
         results = []
         
+        # Only production environments restrict the CID; decide that once for all scenarios
+        enforce_cid = env_id in PRODUCTION_ENVIRONMENTS
+        # Per-test-case values reused by every scenario below
+        test_name = test_case['name']
+        # Add Auto Payment always gets dates applied, even without a config
+        is_add_auto_payment = 'add auto payment' in test_name.lower()
+        
+        # Request-level overrides; they are the same for every scenario, so read them once
+        auto_payment_config = data.get('auto_payment_config', {})
+        apply_auto_payment = bool(auto_payment_config) or is_add_auto_payment
+        # Scenario dates are offsets from one base date, so work it out once
+        auto_payment_base = auto_payment_base_date() if apply_auto_payment else None
+        make_payment_config = data.get('make_payment_config', {})
+        # Parsed once here instead of re-splitting the CSV for every scenario
+        cancel_payment_ids = parse_id_list(_text_param(data, 'cancel_payment_ids'))
+        receipt_payment_ids = _text_param(data, 'receipt_payment_ids')
+        payment_status_id = _text_param(data, 'payment_status_id')
+        
         # Check if test case has multiple bodies (bodies array)
         bodies = test_case.get('bodies', [])
         if bodies:
@@ -1132,247 +1851,344 @@ def run_single_test(test_id):
                 if isinstance(body_config, dict):
                     if 'body' in body_config:
                         scenario_name = body_config.get('name', f'Scenario {idx + 1}')
-                        request_body = body_config['body'].copy() if isinstance(body_config['body'], dict) else body_config['body']
+                        request_body = body_config['body']
                     else:
                         # Direct body object
                         scenario_name = f'Scenario {idx + 1}'
-                        request_body = body_config.copy() if isinstance(body_config, dict) else body_config
+                        request_body = body_config
                 else:
                     # Invalid format
                     results.append({
                         'test_id': test_id,
-                        'test_name': test_case['name'],
+                        'test_name': test_name,
                         'scenario_name': f'Scenario {idx + 1}',
                         'error': 'Invalid body format in bodies array',
                         'success': False,
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': utc_timestamp()
                     })
                     continue
                 
-                # Merge common params into request body
                 if isinstance(request_body, dict):
-                    request_body = merge_common_params(request_body, common_params)
-                
-                # Apply auto payment config if provided (for Add Auto Payment)
-                # Always apply dates for Add Auto Payment, even if config is empty
-                # Use scenario index as day_offset for incremental dates
-                auto_payment_config = data.get('auto_payment_config', {})
-                is_add_auto_payment = 'add auto payment' in test_case.get('name', '').lower()
-                if (auto_payment_config or is_add_auto_payment) and isinstance(request_body, dict):
-                    request_body = request_body.copy()
-                    apply_auto_payment_config(request_body, auto_payment_config, day_offset=idx)
-                
-                # Apply make payment config if provided (for Make Payment)
-                make_payment_config = data.get('make_payment_config', {})
-                if make_payment_config and isinstance(request_body, dict):
-                    request_body = request_body.copy()
-                    apply_make_payment_config(request_body, make_payment_config)
-                
-                # Apply cancel payment config if provided (for Cancel Payment)
-                cancel_payment_ids = data.get('cancel_payment_ids', '')
-                if cancel_payment_ids and isinstance(cancel_payment_ids, str) and cancel_payment_ids.strip() and isinstance(request_body, dict):
-                    request_body = request_body.copy()
-                    apply_cancel_payment_config(request_body, cancel_payment_ids)
-                
-                # Apply receipt payment config if provided (for Get Payment Receipt)
-                receipt_payment_ids = data.get('receipt_payment_ids', '')
-                if receipt_payment_ids and isinstance(receipt_payment_ids, str) and receipt_payment_ids.strip() and isinstance(request_body, dict):
-                    request_body = request_body.copy()
-                    apply_receipt_payment_config(request_body, receipt_payment_ids)
-                
-                # Apply payment status config if provided (for Get Payment Status)
-                payment_status_id = data.get('payment_status_id', '')
-                if payment_status_id and isinstance(payment_status_id, str) and payment_status_id.strip() and isinstance(request_body, dict):
-                    request_body = request_body.copy()
-                    apply_payment_status_config(request_body, payment_status_id)
+                    # Merge common params into a fresh dict: the scenario's one copy of the
+                    # cached body, which the config steps below then edit in place
+                    request_body = _scenario_body(request_body, common_params)
+                    
+                    # Apply auto payment config (for Add Auto Payment), using the
+                    # scenario index as day_offset for incremental dates
+                    if apply_auto_payment:
+                        apply_auto_payment_config(request_body, auto_payment_config, day_offset=idx, base_start_date=auto_payment_base)
+                    
+                    # Apply make payment config if provided (for Make Payment)
+                    if make_payment_config:
+                        apply_make_payment_config(request_body, make_payment_config)
+                    
+                    # Apply cancel payment config if provided (for Cancel Payment)
+                    if cancel_payment_ids:
+                        apply_cancel_payment_config(request_body, cancel_payment_ids)
+                    
+                    # Apply receipt payment config if provided (for Get Payment Receipt)
+                    if receipt_payment_ids:
+                        apply_receipt_payment_config(request_body, receipt_payment_ids)
+                    
+                    # Apply payment status config if provided (for Get Payment Status)
+                    if payment_status_id:
+                        apply_payment_status_config(request_body, payment_status_id)
                 
                 # Validate CID for production environments
-                is_valid, error_message = validate_production_cid(request_body, env_id)
+                is_valid, error_message = validate_production_cid(request_body, env_id) if enforce_cid else CID_CHECK_SKIPPED
                 if not is_valid:
-                    logger.warning(f'🔴 Production CID validation failed for test {test_id}, scenario {scenario_name}: {error_message}')
+                    logger.warning('🔴 Production CID validation failed for test %s, scenario %s: %s', test_id, scenario_name, error_message)
                     results.append({
                         'test_id': test_id,
-                        'test_name': test_case['name'],
+                        'test_name': test_name,
                         'scenario_name': scenario_name,
                         'error': error_message,
                         'success': False,
                         'blocked': True,
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': utc_timestamp()
                     })
                     continue
                 
-                # Execute request
-                result = execute_single_request(test_case, request_body, base_url, env_id, scenario_name)
-                result['test_id'] = test_id
-                result['test_name'] = test_case['name']
-                result['scenario_name'] = scenario_name
-                result['request_body'] = request_body
-                results.append(result)
+                # Queue the request; queued scenarios are sent below
+                results.append((request_body, scenario_name))
         else:
             # Single body - backward compatibility
             request_body = test_case.get('body', {})
             if not isinstance(request_body, dict):
                 request_body = {}
-            else:
-                request_body = request_body.copy()
             
-            # Merge common params into request body
-            if isinstance(request_body, dict):
-                request_body = merge_common_params(request_body, common_params)
-            
-            # Check if payment_account_ids are provided in the request (for Delete Payment Account)
-            payment_account_ids = data.get('payment_account_ids', '')
-            if payment_account_ids and isinstance(payment_account_ids, str) and payment_account_ids.strip():
-                # Parse comma-separated IDs
-                ids_list = [id_str.strip() for id_str in payment_account_ids.split(',') if id_str.strip()]
-                
-                if ids_list:
-                    # Make multiple API calls, one for each ID
-                    for payment_account_id in ids_list:
-                        # Create a copy of the request body with the specific payment_account_id
-                        current_request_body = request_body.copy()
-                        # Convert to int if it's a digit, otherwise keep as string
-                        current_request_body['payment_account_id'] = int(payment_account_id) if payment_account_id.isdigit() else payment_account_id
-                        
-                        # Validate CID for production environments
-                        is_valid, error_message = validate_production_cid(current_request_body, env_id)
-                        if not is_valid:
-                            logger.warning(f'🔴 Production CID validation failed for test {test_id}, payment_account_id {payment_account_id}: {error_message}')
-                            results.append({
-                                'test_id': test_id,
-                                'test_name': test_case['name'],
-                                'scenario_name': f'Payment Account ID: {payment_account_id}',
-                                'error': error_message,
-                                'success': False,
-                                'blocked': True,
-                                'timestamp': datetime.utcnow().isoformat()
-                            })
-                            continue
-                        
-                        # Execute request
-                        result = execute_single_request(test_case, current_request_body, base_url, env_id, f'Payment Account ID: {payment_account_id}')
-                        result['test_id'] = test_id
-                        result['test_name'] = test_case['name']
-                        result['scenario_name'] = f'Payment Account ID: {payment_account_id}'
-                        result['request_body'] = current_request_body
-                        results.append(result)
-                else:
-                    # Empty IDs list - fall through to default behavior
-                    payment_account_ids = None
-            
-            # Check if scheduled_payment_ids are provided in the request (for Delete Auto Payment)
-            scheduled_payment_ids = data.get('scheduled_payment_ids', '')
-            if scheduled_payment_ids and isinstance(scheduled_payment_ids, str) and scheduled_payment_ids.strip():
-                # Parse comma-separated IDs
-                ids_list = [id_str.strip() for id_str in scheduled_payment_ids.split(',') if id_str.strip()]
-                
-                if ids_list:
-                    # Make multiple API calls, one for each ID
-                    for scheduled_payment_id in ids_list:
-                        # Create a copy of the request body with the specific scheduled_payment_id
-                        current_request_body = request_body.copy()
-                        # Convert to int if it's a digit, otherwise keep as string
-                        current_request_body['scheduled_payment_id'] = int(scheduled_payment_id) if scheduled_payment_id.isdigit() else scheduled_payment_id
-                        
-                        # Validate CID for production environments
-                        is_valid, error_message = validate_production_cid(current_request_body, env_id)
-                        if not is_valid:
-                            logger.warning(f'🔴 Production CID validation failed for test {test_id}, scheduled_payment_id {scheduled_payment_id}: {error_message}')
-                            results.append({
-                                'test_id': test_id,
-                                'test_name': test_case['name'],
-                                'scenario_name': f'Scheduled Payment ID: {scheduled_payment_id}',
-                                'error': error_message,
-                                'success': False,
-                                'blocked': True,
-                                'timestamp': datetime.utcnow().isoformat()
-                            })
-                            continue
-                        
-                        # Execute request
-                        result = execute_single_request(test_case, current_request_body, base_url, env_id, f'Scheduled Payment ID: {scheduled_payment_id}')
-                        result['test_id'] = test_id
-                        result['test_name'] = test_case['name']
-                        result['scenario_name'] = f'Scheduled Payment ID: {scheduled_payment_id}'
-                        result['request_body'] = current_request_body
-                        results.append(result)
-                else:
-                    # Empty IDs list - fall through to default behavior
-                    scheduled_payment_ids = None
+            # Merge common params into a fresh dict that the steps below may edit in place
+            request_body = _scenario_body(request_body, common_params)
+            
+            # One scenario per id when id lists are given (Delete Payment Account / Delete Auto Payment)
+            queued_account_ids = _queue_id_scenarios(
+                results, request_body, _text_param(data, 'payment_account_ids'),
+                'payment_account_id', 'Payment Account ID', test_id, test_name, env_id
+            )
+            queued_scheduled_ids = _queue_id_scenarios(
+                results, request_body, _text_param(data, 'scheduled_payment_ids'),
+                'scheduled_payment_id', 'Scheduled Payment ID', test_id, test_name, env_id
+            )
             
             # If no payment_account_ids or scheduled_payment_ids provided, use default behavior
-            if (not payment_account_ids or not isinstance(payment_account_ids, str) or not payment_account_ids.strip()) and \
-               (not scheduled_payment_ids or not isinstance(scheduled_payment_ids, str) or not scheduled_payment_ids.strip()):
-                # Apply auto payment config if provided (for Add Auto Payment)
-                # Always apply dates for Add Auto Payment, even if config is empty
-                # For single body, day_offset is 0
-                auto_payment_config = data.get('auto_payment_config', {})
-                is_add_auto_payment = 'add auto payment' in test_case.get('name', '').lower()
-                if (auto_payment_config or is_add_auto_payment) and isinstance(request_body, dict):
-                    request_body = apply_auto_payment_config(request_body, auto_payment_config, day_offset=0)
-                
-                # Apply make payment config if provided (for Make Payment)
-                make_payment_config = data.get('make_payment_config', {})
-                if make_payment_config and isinstance(request_body, dict):
+            if not (queued_account_ids or queued_scheduled_ids):
+                # Apply the request-level configs (request_body is always a dict here);
+                # for single body, day_offset is 0
+                if apply_auto_payment:
+                    request_body = apply_auto_payment_config(request_body, auto_payment_config, day_offset=0, base_start_date=auto_payment_base)
+                if make_payment_config:
                     request_body = apply_make_payment_config(request_body, make_payment_config)
-                
-                # Apply cancel payment config if provided (for Cancel Payment)
-                cancel_payment_ids = data.get('cancel_payment_ids', '')
-                if cancel_payment_ids and isinstance(cancel_payment_ids, str) and cancel_payment_ids.strip() and isinstance(request_body, dict):
+                if cancel_payment_ids:
                     request_body = apply_cancel_payment_config(request_body, cancel_payment_ids)
-                
-                # Apply receipt payment config if provided (for Get Payment Receipt)
-                receipt_payment_ids = data.get('receipt_payment_ids', '')
-                if receipt_payment_ids and isinstance(receipt_payment_ids, str) and receipt_payment_ids.strip() and isinstance(request_body, dict):
+                if receipt_payment_ids:
                     request_body = apply_receipt_payment_config(request_body, receipt_payment_ids)
-                
-                # Apply payment status config if provided (for Get Payment Status)
-                payment_status_id = data.get('payment_status_id', '')
-                if payment_status_id and isinstance(payment_status_id, str) and payment_status_id.strip() and isinstance(request_body, dict):
+                if payment_status_id:
                     request_body = apply_payment_status_config(request_body, payment_status_id)
                 
                 # Validate CID for production environments
-                is_valid, error_message = validate_production_cid(request_body, env_id)
+                is_valid, error_message = validate_production_cid(request_body, env_id) if enforce_cid else CID_CHECK_SKIPPED
                 if not is_valid:
-                    logger.warning(f'🔴 Production CID validation failed for test {test_id}: {error_message}')
+                    logger.warning('🔴 Production CID validation failed for test %s: %s', test_id, error_message)
                     return jsonify({
                         'test_id': test_id,
-                        'test_name': test_case['name'],
+                        'test_name': test_name,
                         'error': error_message,
                         'success': False,
                         'blocked': True,
-                        'timestamp': datetime.utcnow().isoformat()
+                        'timestamp': utc_timestamp()
                     }), 403
                 
                 # Execute request
-                result = execute_single_request(test_case, request_body, base_url, env_id)
+                result = execute_single_request(
+                    test_case, request_body, base_url, env_id, include_headers=include_headers, use_cache=use_cache
+                )
                 result['test_id'] = test_id
-                result['test_name'] = test_case['name']
+                result['test_name'] = test_name
                 result['request_body'] = request_body
                 results.append(result)
         
+        _run_queued_scenarios(results, test_case, base_url, env_id, include_headers, use_cache)
+        
         # Return single result for backward compatibility, or array if multiple bodies
         if len(results) == 1:
             return jsonify(results[0]), 200
         else:
+            # Count outcomes in a single pass over the results
+            passed = blocked = 0
+            for r in results:
+                if r.get('success', False):
+                    passed += 1
+                if r.get('blocked', False):
+                    blocked += 1
+            
             return jsonify({
                 'test_id': test_id,
-                'test_name': test_case['name'],
+                'test_name': test_name,
                 'has_multiple_scenarios': True,
                 'results': results,
                 'summary': {
                     'total': len(results),
-                    'passed': sum(1 for r in results if r.get('success', False)),
-                    'failed': sum(1 for r in results if not r.get('success', False)),
-                    'blocked': sum(1 for r in results if r.get('blocked', False))
+                    'passed': passed,
+                    'failed': len(results) - passed,
+                    'blocked': blocked
                 }
             }), 200
             
     except Exception as e:
-        logger.error(f'Error running test: {e}')
+        logger.exception('Error running test: %s', e)
         return jsonify({'error': str(e)}), 500
 
 
+def is_read_only(test_case: Dict[str, Any]) -> bool:
+    """True for test cases that do not change upstream state: GETs and ones marked "cacheable"."""
+    return test_case['method'] == 'GET' or bool(test_case.get('cacheable'))
+
+
+def _exec_case(
+    test_case: Dict[str, Any],
+    request_body: Any,
+    base_url: str,
+    env_id: str,
+    scenario_name: Optional[str] = None,
+    include_headers: bool = False,
+    merged_headers: Optional[Dict[str, str]] = None,
+    use_cache: bool = False
+) -> Dict[str, Any]:
+    """Run one validated request of a run-all pass and tag the result with its test case."""
+    result = execute_single_request(
+        test_case, request_body, base_url, env_id, scenario_name, include_headers, merged_headers, use_cache
+    )
+    return _tag_case_result(result, test_case, request_body, scenario_name)
+
+
+def _tag_case_result(
+    result: Dict[str, Any],
+    test_case: Dict[str, Any],
+    request_body: Any,
+    scenario_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Add the test case fields the run-all response carries to a request result."""
+    result['test_id'] = test_case['id']
+    result['test_name'] = test_case['name']
+    result['category'] = test_case.get('category', 'Uncategorized')
+    if scenario_name is not None:
+        result['scenario_name'] = scenario_name
+    result['request_body'] = request_body
+    return result
+
+
+def _run_batch(
+    batch_endpoint: str,
+    jobs: list,
+    base_url: str,
+    env_id: str,
+    include_headers: bool = False
+) -> list:
+    """
+    Send queued run-all requests to an environment's batch endpoint in one call.
+    
+    The batch body is {"requests": [{"id", "method", "relative_url", "headers", "body"}]};
+    the reply is expected as {"responses": [...]} (or a bare list) of items carrying the
+    matching "id", a "status_code" (or "status"), and optional "body" and "headers".
+    
+    Args:
+        batch_endpoint: Path of the batch endpoint, relative to base_url
+        jobs: (test_case, request_body, scenario_name) tuples to send
+        base_url: Base URL of the environment
+        env_id: Environment ID (used for auth headers)
+        include_headers: Copy each item's response headers into its result
+    
+    Returns:
+        One result dict per job, in job order
+    """
+    batch_requests = [
+        {
+            'id': str(idx),
+            'method': test_case['method'],
+            'relative_url': test_case['endpoint'],
+            # Global custom headers and the environment API key, as on a non-batch run;
+            # the batch call itself carries the bearer token
+            'headers': merge_headers(test_case.get('headers', {}), environment_id=env_id),
+            'body': request_body
+        }
+        for idx, (test_case, request_body, _) in enumerate(jobs)
+    ]
+    headers = merge_headers({'Content-Type': 'application/json'}, use_bearer_token=True, environment_id=env_id)
+    
+    started_ns = time.perf_counter_ns()
+    try:
+        response = HTTP_SESSION.post(
+            f'{base_url}{batch_endpoint}',
+            headers=headers,
+            data=json_dumps({'requests': batch_requests}),
+            timeout=API_TIMEOUT
+        )
+        if not 200 <= response.status_code < 300:
+            raise ValueError(f'Batch request failed: {response.status_code} - {response.text}')
+        payload = json_loads(response.content)
+        items = payload.get('responses', []) if isinstance(payload, dict) else payload
+        items_by_id = {str(item.get('id')): item for item in items if isinstance(item, dict)}
+        batch_error = None
+    except Exception as e:
+        logger.error('Batch request to %s failed: %s', batch_endpoint, e)
+        items_by_id = {}
+        batch_error = str(e)
+    
+    # Every item shares the round trip of the single batch call
+    duration_ms = round((time.perf_counter_ns() - started_ns) / 1e6, 2)
+    timestamp = utc_timestamp()
+    
+    results = []
+    for idx, (test_case, request_body, scenario_name) in enumerate(jobs):
+        item = items_by_id.get(str(idx))
+        if item is None:
+            result = {
+                'error': batch_error or 'No response for this request in the batch reply',
+                'success': False,
+                'timestamp': timestamp
+            }
+        else:
+            status_code = item.get('status_code', item.get('status'))
+            response_data = item.get('body')
+            item_headers = item.get('headers') or {}
+            result = {
+                'status_code': status_code,
+                'success': isinstance(status_code, int) and 200 <= status_code < 300,
+                'response_time_ms': duration_ms,
+                'response_data': response_data,
+                'response_data_type': 'json' if isinstance(response_data, (dict, list)) else 'text',
+                'content_type': item_headers.get('Content-Type', item_headers.get('content-type', '')),
+                'timestamp': timestamp
+            }
+            if include_headers:
+                result['headers'] = filter_response_headers(item_headers)
+        results.append(_tag_case_result(result, test_case, request_body, scenario_name))
+    return results
+
+
+def _blocked_result(
+    test_case: Dict[str, Any],
+    error_message: str,
+    timestamp: str,
+    scenario_name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Result for a run-all request that production CID validation refused to send."""
+    result = {
+        'test_id': test_case['id'],
+        'test_name': test_case['name'],
+        'category': test_case.get('category', 'Uncategorized')
+    }
+    if scenario_name is not None:
+        result['scenario_name'] = scenario_name
+    result.update(error=error_message, success=False, blocked=True, timestamp=timestamp)
+    return result
+
+
+def _run_summary(total: int, passed: int, blocked: int, response_time_sum: float) -> Dict[str, Any]:
+    """Summary block of a run-all response from its tallied counts."""
+    return {
+        'total': total,
+        'passed': passed,
+        'failed': total - passed,
+        'blocked': blocked,
+        'avg_response_time_ms': round(response_time_sum / passed, 2) if passed else 0.0
+    }
+
+
+def _stream_run_results(ready: Iterable[tuple], finished: Iterable[tuple]):
+    """
+    Yield a run-all pass as NDJSON: one line per result, in completion order, then a
+    final line holding the summary.
+    
+    ready holds (index, result) pairs known before sending (blocked or invalid cases);
+    finished yields the sent ones as they complete. index is the result's position in
+    the buffered response, written as 'result_index' so clients can restore file and
+    scenario order. Each result is counted and serialized as it arrives, so nothing is
+    buffered for the whole run.
+    """
+    total = passed = blocked = 0
+    response_time_sum = 0
+    try:
+        for idx, r in chain(ready, finished):
+            r['result_index'] = idx
+            total += 1
+            if r.get('success', False):
+                passed += 1
+                response_time_sum += r.get('response_time_ms', 0)
+            if r.get('blocked', False):
+                blocked += 1
+            yield app.json.dumps(r) + '\n'
+    except Exception as e:
+        # The 200 status is already sent, so report the failure in-band
+        logger.exception('Error streaming test results: %s', e)
+        yield app.json.dumps({'error': str(e)}) + '\n'
+        return
+    yield app.json.dumps({
+        'summary': _run_summary(total, passed, blocked, response_time_sum),
+        'timestamp': utc_timestamp()
+    }) + '\n'
+
+
 @app.route('/api/run-all-tests', methods=['POST'])
 def run_all_tests():
     """Run all test cases. Supports both single body and multiple bodies (bodies array)."""
@@ -1380,26 +2196,34 @@ def run_all_tests():
         # Get environment from request
         data = request.get_json() or {}
         env_id = data.get('environment', 'capricorn-trunk')
+        # Response headers are opt-in to keep result payloads small
+        include_headers = request.args.get('include_headers') == '1'
+        # ?no_cache=1 always hits the live API, even when RESPONSE_CACHE_TTL is set
+        use_cache = request.args.get('no_cache') != '1'
+        # ?stream=1 sends results as NDJSON lines as they complete instead of one JSON document
+        stream_results = request.args.get('stream') == '1'
         
-        # Load environments config
-        with open('environments.json', 'r') as f:
-            env_config = json.load(f)
-        
-        # Find the environment
-        env = next((e for e in env_config['environments'] if e['id'] == env_id), None)
+        # Load environments config (cached, reloaded when the file changes) and find the environment
+        _, environments_by_id = load_environments()
+        env = environments_by_id.get(env_id)
         if not env:
             return jsonify({'error': f'Environment {env_id} not found'}), 404
         
         # Load test cases for this environment
         test_cases_file = env['test_cases_file']
-        with open(test_cases_file, 'r') as f:
-            test_data = json.load(f)
+        test_data, _, prepared_test_cases = load_test_data(test_cases_file)
         
+        # Only production environments restrict the CID; decide that once for all scenarios
+        enforce_cid = env_id in PRODUCTION_ENVIRONMENTS
         results = []
         base_url = test_data['base_url']
         common_params = test_data.get('common_params', {})
         
-        for test_case in test_data['test_cases']:
+        # Phase 1: build and validate every request body up front. Blocked cases get
+        # their result immediately; runnable ones are queued so no HTTP call starts
+        # until validation of the whole run is done
+        validated_at = utc_timestamp()
+        for test_case in prepared_test_cases:
             # Check if test case has multiple bodies (bodies array)
             bodies = test_case.get('bodies', [])
             if bodies:
@@ -1423,7 +2247,7 @@ def run_all_tests():
                             'scenario_name': f'Scenario {idx + 1}',
                             'error': 'Invalid body format in bodies array',
                             'success': False,
-                            'timestamp': datetime.utcnow().isoformat()
+                            'timestamp': utc_timestamp()
                         })
                         continue
                     
@@ -1432,29 +2256,17 @@ def run_all_tests():
                         request_body = merge_common_params(request_body, common_params)
                     
                     # Validate CID for production environments
-                    is_valid, error_message = validate_production_cid(request_body, env_id)
+                    is_valid, error_message = validate_production_cid(request_body, env_id) if enforce_cid else CID_CHECK_SKIPPED
                     if not is_valid:
-                        logger.warning(f'🔴 Production CID validation failed for test {test_case["id"]}, scenario {scenario_name}: {error_message}')
-                        results.append({
-                            'test_id': test_case['id'],
-                            'test_name': test_case['name'],
-                            'category': test_case.get('category', 'Uncategorized'),
-                            'scenario_name': scenario_name,
-                            'error': error_message,
-                            'success': False,
-                            'blocked': True,
-                            'timestamp': datetime.utcnow().isoformat()
-                        })
+                        logger.warning(
+                            '🔴 Production CID validation failed for test %s, scenario %s: %s',
+                            test_case["id"], scenario_name, error_message
+                        )
+                        results.append(_blocked_result(test_case, error_message, validated_at, scenario_name))
                         continue
                     
-                    # Execute request
-                    result = execute_single_request(test_case, request_body, base_url, env_id, scenario_name)
-                    result['test_id'] = test_case['id']
-                    result['test_name'] = test_case['name']
-                    result['category'] = test_case.get('category', 'Uncategorized')
-                    result['scenario_name'] = scenario_name
-                    result['request_body'] = request_body
-                    results.append(result)
+                    # Queue the request; dispatched after all cases are prepared
+                    results.append((test_case, request_body, scenario_name))
             else:
                 # Single body - backward compatibility
                 request_body = test_case.get('body', {}).copy()
@@ -1464,48 +2276,71 @@ def run_all_tests():
                     request_body = merge_common_params(request_body, common_params)
                 
                 # Validate CID for production environments
-                is_valid, error_message = validate_production_cid(request_body, env_id)
+                is_valid, error_message = validate_production_cid(request_body, env_id) if enforce_cid else CID_CHECK_SKIPPED
                 if not is_valid:
-                    logger.warning(f'🔴 Production CID validation failed for test {test_case["id"]}: {error_message}')
-                    results.append({
-                        'test_id': test_case['id'],
-                        'test_name': test_case['name'],
-                        'category': test_case.get('category', 'Uncategorized'),
-                        'error': error_message,
-                        'success': False,
-                        'blocked': True,
-                        'timestamp': datetime.utcnow().isoformat()
-                    })
+                    logger.warning('🔴 Production CID validation failed for test %s: %s', test_case["id"], error_message)
+                    results.append(_blocked_result(test_case, error_message, validated_at))
                     continue
                 
-                # Execute request
-                result = execute_single_request(test_case, request_body, base_url, env_id)
-                result['test_id'] = test_case['id']
-                result['test_name'] = test_case['name']
-                result['category'] = test_case.get('category', 'Uncategorized')
-                result['request_body'] = request_body
-                results.append(result)
+                # Queue the request; dispatched after all cases are prepared
+                results.append((test_case, request_body, None))
         
-        summary = {
-            'total': len(results),
-            'passed': sum(1 for r in results if r.get('success', False)),
-            'failed': sum(1 for r in results if not r.get('success', False)),
-            'blocked': sum(1 for r in results if r.get('blocked', False)),
-            'avg_response_time_ms': round(
-                sum(r.get('response_time_ms', 0) for r in results if r.get('success', False)) / 
-                max(sum(1 for r in results if r.get('success', False)), 1),
-                2
-            )
-        }
+        # Phase 2: send the queued requests, either as one batch call when the environment
+        # exposes a batch endpoint or on the shared pool: read-only cases run
+        # concurrently, state-changing ones keep file order, one at a time
+        pending = [(idx, entry) for idx, entry in enumerate(results) if isinstance(entry, tuple)]
+        jobs = [job for _, job in pending]
+        outcomes = futures = None
+        if env.get('batch_endpoint'):
+            outcomes = _run_batch(env['batch_endpoint'], jobs, base_url, env_id, include_headers)
+        else:
+            # Global headers and the bearer token are the same for every case, so
+            # resolve them once and only overlay each case's own headers
+            base_headers = merge_headers({}, use_bearer_token=True, environment_id=env_id) if jobs else {}
+            futures = submit_requests([
+                (
+                    is_read_only(test_case),
+                    _exec_case,
+                    (test_case, request_body, base_url, env_id, scenario_name, include_headers,
+                     overlay_headers(base_headers, test_case.get('headers'), env_id), use_cache)
+                )
+                for test_case, request_body, scenario_name in jobs
+            ])
+        
+        if stream_results:
+            ready = [(idx, r) for idx, r in enumerate(results) if not isinstance(r, tuple)]
+            if futures is None:
+                finished = zip((idx for idx, _ in pending), outcomes)
+            else:
+                index_of = {future: idx for (idx, _), future in zip(pending, futures)}
+                finished = ((index_of[future], future.result()) for future in as_completed(futures))
+            return Response(_stream_run_results(ready, finished), mimetype='application/x-ndjson')
+        
+        if futures is not None:
+            outcomes = [future.result() for future in futures]
+        
+        # Slot the outcomes back in so results keep test case order
+        for (idx, _), outcome in zip(pending, outcomes):
+            results[idx] = outcome
+        
+        # Aggregate the summary in a single pass over the results
+        passed = blocked = 0
+        response_time_sum = 0
+        for r in results:
+            if r.get('success', False):
+                passed += 1
+                response_time_sum += r.get('response_time_ms', 0)
+            if r.get('blocked', False):
+                blocked += 1
         
         return jsonify({
-            'summary': summary,
+            'summary': _run_summary(len(results), passed, blocked, response_time_sum),
             'results': results,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': utc_timestamp()
         }), 200
         
     except Exception as e:
-        logger.error(f'Error running all tests: {e}')
+        logger.exception('Error running all tests: %s', e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -1521,19 +2356,15 @@ def run_workflow():
         if not workflow:
             return jsonify({'error': 'Workflow not specified'}), 400
         
-        # Load environments config
-        with open('environments.json', 'r') as f:
-            env_config = json.load(f)
-        
-        # Find the environment
-        env = next((e for e in env_config['environments'] if e['id'] == env_id), None)
+        # Load environments config and find the environment
+        _, environments_by_id = load_environments()
+        env = environments_by_id.get(env_id)
         if not env:
             return jsonify({'error': f'Environment {env_id} not found'}), 404
         
-        # Load test cases for this environment
+        # Load test cases for this environment (cached and shared - step bodies are copied before edits)
         test_cases_file = env['test_cases_file']
-        with open(test_cases_file, 'r') as f:
-            test_data = json.load(f)
+        test_data, _, _ = load_test_data(test_cases_file)
         
         base_url = test_data['base_url']
         common_params = test_data.get('common_params', {})
@@ -1556,30 +2387,19 @@ def run_workflow():
             }
             
             # Find test cases
-            get_auto_payments_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'get auto payments' in tc.get('name', '').lower()),
-                None
-            )
-            delete_auto_payment_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'delete auto payment' in tc.get('name', '').lower()),
-                None
-            )
-            get_payment_accounts_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'get payment accounts' in tc.get('name', '').lower()),
-                None
-            )
-            add_auto_payment_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'add auto payment' in tc.get('name', '').lower()),
-                None
-            )
-            approve_split_auto_payment_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'approve split auto payment' in tc.get('name', '').lower()),
-                None
+            (
+                get_auto_payments_test,
+                delete_auto_payment_test,
+                get_payment_accounts_test,
+                add_auto_payment_test,
+                approve_split_auto_payment_test,
+            ) = _find_test_cases_by_name(
+                test_data['test_cases'],
+                'get auto payments',
+                'delete auto payment',
+                'get payment accounts',
+                'add auto payment',
+                'approve split auto payment',
             )
             
             if not get_auto_payments_test:
@@ -1670,7 +2490,7 @@ def run_workflow():
                             if payment_id:
                                 payments_to_delete.append(payment_id)
                                 monthly_ids_found.append(payment_id)
-                                logger.info(f'Found monthly payment with ID: {payment_id}')
+                                logger.info('Found monthly payment with ID: %s', payment_id)
                 
                 # Extract IDs from bimonthly payments (has first_payment.id and second_payment.id)
                 if 'bimonthly' in data and isinstance(data['bimonthly'], list):
@@ -1683,7 +2503,7 @@ def run_workflow():
                                 if first_id:
                                     payments_to_delete.append(first_id)
                                     bimonthly_ids_found.append(first_id)
-                                    logger.info(f'Found bimonthly first payment with ID: {first_id}')
+                                    logger.info('Found bimonthly first payment with ID: %s', first_id)
                             
                             # Get second_payment.id
                             second_payment = bimonthly_payment.get('second_payment', {})
@@ -1692,7 +2512,7 @@ def run_workflow():
                                 if second_id:
                                     payments_to_delete.append(second_id)
                                     bimonthly_ids_found.append(second_id)
-                                    logger.info(f'Found bimonthly second payment with ID: {second_id}')
+                                    logger.info('Found bimonthly second payment with ID: %s', second_id)
                 
                 # Extract IDs from split payments
                 if 'split' in data and isinstance(data['split'], list):
@@ -1702,7 +2522,7 @@ def run_workflow():
                             if payment_id:
                                 payments_to_delete.append(payment_id)
                                 split_ids_found.append(payment_id)
-                                logger.info(f'Found split payment with ID: {payment_id}')
+                                logger.info('Found split payment with ID: %s', payment_id)
             
             # Update summary for getAutoPayments
             if get_result.get('success', False):
@@ -1721,13 +2541,16 @@ def run_workflow():
             deleted_split_ids = []
             
             if payments_to_delete:
-                logger.info(f'🔄 Workflow: Step 2 - Deleting {len(payments_to_delete)} auto payment(s)...')
+                logger.info('🔄 Workflow: Step 2 - Deleting %s auto payment(s)...', len(payments_to_delete))
                 delete_request_body_base = delete_auto_payment_test.get('body', {}).copy()
                 
                 # Merge common params into base delete request body
                 if isinstance(delete_request_body_base, dict):
                     delete_request_body_base = merge_common_params(delete_request_body_base, common_params)
                 
+                # Every iteration sends the same test case, so merge its headers once
+                delete_headers = merge_headers(delete_auto_payment_test.get('headers', {}), use_bearer_token=True, environment_id=env_id)
+                
                 for payment_id in payments_to_delete:
                     delete_request_body = delete_request_body_base.copy()
                     # Track which type of payment is being deleted
@@ -1757,7 +2580,8 @@ def run_workflow():
                         delete_request_body.copy(),
                         base_url,
                         env_id,
-                        f'Delete Auto Payment (ID: {payment_id})'
+                        f'Delete Auto Payment (ID: {payment_id})',
+                        merged_headers=delete_headers
                     )
                     
                     if delete_result.get('success', False):
@@ -1885,7 +2709,7 @@ def run_workflow():
                     'steps': steps
                 }), 500
             
-            logger.info(f'🔄 Workflow: Extracted payment_account_id: {payment_account_id}, payment_type_id: {payment_type_id}')
+            logger.info('🔄 Workflow: Extracted payment_account_id: %s, payment_type_id: %s', payment_account_id, payment_type_id)
             
             # Step 4: Add Auto Payment - Execute all test cases
             logger.info('🔄 Workflow: Step 4 - Adding auto payments (all scenarios)...')
@@ -1895,6 +2719,10 @@ def run_workflow():
             added_split_ids = []
             
             if add_bodies:
+                # Scenario dates are offsets from one base date, so work it out once
+                auto_payment_base = auto_payment_base_date()
+                # Every iteration sends the same test case, so merge its headers once
+                add_headers = merge_headers(add_auto_payment_test.get('headers', {}), use_bearer_token=True, environment_id=env_id)
                 # Execute all bodies (Monthly, Split, Bimonthly, etc.)
                 for idx, body_config in enumerate(add_bodies):
                     # Support both object with 'name' and 'body' or just direct body object
@@ -1926,7 +2754,7 @@ def run_workflow():
                         'payment_account_id': payment_account_id,
                         'payment_type_id': payment_type_id
                     }
-                    apply_auto_payment_config(add_request_body, auto_payment_config, day_offset=idx)
+                    apply_auto_payment_config(add_request_body, auto_payment_config, day_offset=idx, base_start_date=auto_payment_base)
                     
                     # Validate CID for production environments
                     is_valid, error_message = validate_production_cid(add_request_body, env_id)
@@ -1945,7 +2773,8 @@ def run_workflow():
                         add_request_body,
                         base_url,
                         env_id,
-                        f'Add Auto Payment - {scenario_name}'
+                        f'Add Auto Payment - {scenario_name}',
+                        merged_headers=add_headers
                     )
                     
                     # Extract ID from response if successful
@@ -2092,7 +2921,7 @@ def run_workflow():
                             first_split = data['split'][0]
                             if isinstance(first_split, dict):
                                 split_payment_id = first_split.get('id')
-                                logger.info(f'🔄 Workflow: Found split payment ID: {split_payment_id}')
+                                logger.info('🔄 Workflow: Found split payment ID: %s', split_payment_id)
                     
                     if split_payment_id:
                         # Update approve request body with the extracted split payment ID
@@ -2157,7 +2986,7 @@ def run_workflow():
                                         if approve_payment_account_id:
                                             # Update approve request body with the extracted payment_account_id
                                             approve_request_body['payment_account_id'] = approve_payment_account_id
-                                            logger.info(f'🔄 Workflow: Using payment_account_id: {approve_payment_account_id}')
+                                            logger.info('🔄 Workflow: Using payment_account_id: %s', approve_payment_account_id)
                                             
                                             # Validate CID for production environments
                                             is_valid, error_message = validate_production_cid(approve_request_body, env_id)
@@ -2171,7 +3000,10 @@ def run_workflow():
                                                 })
                                             else:
                                                 # Execute approveSplitAutoPayment
-                                                logger.info(f'🔄 Workflow: Step 6 - Approving split auto payment (ID: {split_payment_id}, Payment Account ID: {approve_payment_account_id})...')
+                                                logger.info(
+                                                    '🔄 Workflow: Step 6 - Approving split auto payment (ID: %s, Payment Account ID: %s)...',
+                                                    split_payment_id, approve_payment_account_id
+                                                )
                                                 approve_result = execute_single_request(
                                                     approve_split_auto_payment_test,
                                                     approve_request_body,
@@ -2242,7 +3074,7 @@ def run_workflow():
                 'workflow': workflow,
                 'steps': steps,
                 'summary': workflow_summary,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': utc_timestamp()
             }), 200
         
         elif workflow == 'payment-account':
@@ -2260,20 +3092,15 @@ def run_workflow():
             }
             
             # Find test cases
-            get_payment_accounts_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'get payment accounts' in tc.get('name', '').lower()),
-                None
-            )
-            delete_payment_account_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'delete payment account' in tc.get('name', '').lower()),
-                None
-            )
-            add_payment_account_test = next(
-                (tc for tc in test_data['test_cases'] 
-                 if 'add payment account' in tc.get('name', '').lower()),
-                None
+            (
+                get_payment_accounts_test,
+                delete_payment_account_test,
+                add_payment_account_test,
+            ) = _find_test_cases_by_name(
+                test_data['test_cases'],
+                'get payment accounts',
+                'delete payment account',
+                'add payment account',
             )
             
             if not get_payment_accounts_test:
@@ -2362,7 +3189,7 @@ def run_workflow():
                     account_id = account.get('id')
                     if account_id:
                         payment_account_ids_found.append(account_id)
-                        logger.info(f'Found payment account with ID: {account_id}')
+                        logger.info('Found payment account with ID: %s', account_id)
             
             # Update summary for getPaymentAccounts
             workflow_summary['get_payment_accounts'] = {
@@ -2374,13 +3201,16 @@ def run_workflow():
             deleted_payment_account_ids = []
             
             if payment_account_ids_found:
-                logger.info(f'🔄 Workflow: Step 2 - Deleting {len(payment_account_ids_found)} payment account(s)...')
+                logger.info('🔄 Workflow: Step 2 - Deleting %s payment account(s)...', len(payment_account_ids_found))
                 delete_request_body_base = delete_payment_account_test.get('body', {}).copy()
                 
                 # Merge common params into base delete request body
                 if isinstance(delete_request_body_base, dict):
                     delete_request_body_base = merge_common_params(delete_request_body_base, common_params)
                 
+                # Every iteration sends the same test case, so merge its headers once
+                delete_headers = merge_headers(delete_payment_account_test.get('headers', {}), use_bearer_token=True, environment_id=env_id)
+                
                 for account_id in payment_account_ids_found:
                     delete_request_body = delete_request_body_base.copy()
                     delete_request_body['payment_account_id'] = account_id
@@ -2402,7 +3232,8 @@ def run_workflow():
                         delete_request_body,
                         base_url,
                         env_id,
-                        f'Delete Payment Account (ID: {account_id})'
+                        f'Delete Payment Account (ID: {account_id})',
+                        merged_headers=delete_headers
                     )
                     
                     if delete_result.get('success', False):
@@ -2434,6 +3265,8 @@ def run_workflow():
             added_payment_account_ids = []
             
             if add_payment_account_bodies:
+                # Every iteration sends the same test case, so merge its headers once
+                add_headers = merge_headers(add_payment_account_test.get('headers', {}), use_bearer_token=True, environment_id=env_id)
                 # Execute all bodies (ACH Account, Visa Debit Card, Visa Credit Card, etc.)
                 for idx, body_config in enumerate(add_payment_account_bodies):
                     # Support both object with 'name' and 'body' or just direct body object
@@ -2476,7 +3309,8 @@ def run_workflow():
                         add_request_body,
                         base_url,
                         env_id,
-                        f'Add Payment Account - {scenario_name}'
+                        f'Add Payment Account - {scenario_name}',
+                        merged_headers=add_headers
                     )
                     
                     # Extract payment account ID from response if successful
@@ -2486,7 +3320,7 @@ def run_workflow():
                             created_id = response_data.get('id') or response_data.get('payment_account_id')
                             if created_id:
                                 added_payment_account_ids.append(created_id)
-                                logger.info(f'🔄 Workflow: Created payment account with ID: {created_id} ({scenario_name})')
+                                logger.info('🔄 Workflow: Created payment account with ID: %s (%s)', created_id, scenario_name)
                     
                     steps.append({
                         'name': f'Add Payment Account - {scenario_name}',
@@ -2539,7 +3373,7 @@ def run_workflow():
                         added_payment_account_id = response_data.get('id') or response_data.get('payment_account_id')
                         if added_payment_account_id:
                             added_payment_account_ids.append(added_payment_account_id)
-                            logger.info(f'🔄 Workflow: Created payment account with ID: {added_payment_account_id}')
+                            logger.info('🔄 Workflow: Created payment account with ID: %s', added_payment_account_id)
                 
                 # Update summary for addPaymentAccount
                 workflow_summary['add_payment_account'] = {
@@ -2555,13 +3389,13 @@ def run_workflow():
                 'workflow': workflow,
                 'steps': steps,
                 'summary': workflow_summary,
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': utc_timestamp()
             }), 200
         else:
             return jsonify({'error': f'Unknown workflow: {workflow}'}), 400
             
     except Exception as e:
-        logger.error(f'Error running workflow: {e}')
+        logger.exception('Error running workflow: %s', e)
         return jsonify({
             'success': False,
             'error': str(e),
@@ -2583,7 +3417,7 @@ if __name__ == '__main__':
     print(f"{'='*60}\n")
     
     if debug:
-        print("⚡ Hot-reload enabled - changes will auto-reload\n")
+        print("⚡ Hot-reload enabled - changes will auto-reload (the reloader runs a second copy of the app)\n")
     
-    app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=debug)
+    app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=debug, threaded=True)
 
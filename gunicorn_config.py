@@ -1,18 +1,33 @@
 """Gunicorn configuration file."""
 import multiprocessing
 import os
+import sys
 
 # Server Socket
 bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
 backlog = 2048
 
 # Worker Processes
-workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = 'sync'
-worker_connections = 1000
-max_requests = 1000
-max_requests_jitter = 50
+# Threaded workers let concurrent I/O-bound requests (e.g. overlapping run-all
+# calls) proceed in parallel instead of queueing behind one another.
+# GUNICORN_WORKER_CLASS=gevent (requires the gevent package) serves up to
+# worker_connections requests per worker on greenlets; Gunicorn's gevent worker
+# monkey-patches sockets and threads itself, so requests and the app's thread
+# pool become cooperative without changes to app.py
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+# Async workers are each concurrent already, so one per CPU is enough for them
+_async_worker = worker_class in ('gevent', 'eventlet')
+_default_workers = multiprocessing.cpu_count() if _async_worker else multiprocessing.cpu_count() * 2 + 1
+workers = int(os.getenv('GUNICORN_WORKERS', _default_workers))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+# Recycle workers to bound slow leaks, but rarely enough that warm upstream
+# connection pools are not thrown away every few minutes
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '500'))
 timeout = 30
+# Time a recycled or stopping worker gets to finish in-flight test runs
+graceful_timeout = 30
 keepalive = 2
 
 # Logging
@@ -33,7 +48,19 @@ group = None
 tmp_upload_dir = None
 
 # Preload Application
-preload_app = False
+# Import app.py once in the master and fork workers from it, so its module state is
+# shared copy-on-write; app.py re-creates its HTTP sessions and thread pool in each
+# forked worker. Off by default for async workers, whose monkey-patching must run
+# before the app's locks and threads are created
+preload_app = os.getenv('GUNICORN_PRELOAD', '0' if _async_worker else '1') == '1'
+
+# Server Hooks
+def worker_exit(server, worker):
+    """Close the app's pooled upstream connections cleanly instead of dropping them on exit."""
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.close_http_clients()
+
 
 # SSL (if needed)
 # keyfile = None